@@ -0,0 +1,62 @@
+"""Launch benchmark: page-load time and memory of a provider's start page per Chrome launch profile.
+
+Usage:
+    python -m benchmarks.bench_launch --provider chatgpt [--profiles default lean] [--settle 5]
+
+Each profile launches its own ChromeBrowser, opens the provider's start page
+through its readiness gate, waits ``--settle`` seconds for late requests and
+then reports the DevTools Performance metrics of the tab and the resident
+memory of all browser processes (with psutil installed).
+"""
+import time
+import argparse
+from typing import Any, Dict
+from llm_provider.config import CONFIG
+from llm_provider.browsers.chrome import ChromeBrowser
+
+METRICS = [('JSHeapUsedSize', 'heap MB', 2 ** 20), ('Nodes', 'nodes', 1), ('Documents', 'docs', 1)]
+
+def measure(profile: str, config: Dict[str, Any], settle: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    browser = ChromeBrowser(launch_profile=profile)
+    launched = time.perf_counter()
+    try:
+        ready = browser.navigate(
+            config['url'],
+            [config[key] for key in config.get('ready_selectors', [])],
+            max_wait=config.get('ready_max_wait', 30)
+        )
+        loaded = time.perf_counter()
+        time.sleep(settle)
+        return {
+            'launch_s': launched - start,
+            'load_s': loaded - launched,
+            'ready': ready,
+            'metrics': browser.get_performance_metrics() or {},
+            'rss': browser.get_process_rss()
+        }
+    finally:
+        browser.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--provider', default='chatgpt', help='config section whose start page is loaded')
+    parser.add_argument('--profiles', nargs='+', default=['default', 'lean'], help='entries of chrome.launch_profiles')
+    parser.add_argument('--settle', type=float, default=5, help='seconds to wait after the page is ready')
+    args = parser.parse_args()
+
+    config = CONFIG[args.provider]
+    header = f'{"profile":<12}{"launch s":>10}{"load s":>9}{"ready":>7}'
+    header += ''.join(f'{label:>10}' for _, label, _ in METRICS) + f'{"RSS MB":>10}'
+    print(header)
+    for profile in args.profiles:
+        result = measure(profile, config, args.settle)
+        row = f'{profile:<12}{result["launch_s"]:>10.2f}{result["load_s"]:>9.2f}{str(result["ready"]):>7}'
+        for name, _, scale in METRICS:
+            value = result['metrics'].get(name)
+            row += f'{value / scale:>10.1f}' if value is not None else f'{"-":>10}'
+        row += f'{result["rss"] / 2 ** 20:>10.1f}' if result['rss'] is not None else f'{"-":>10}'
+        print(row)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark: legacy multi-parse HTML cleanup vs the one-pass extraction engine.
+
+Usage:
+    python -m benchmarks.bench_preprocessing [--blocks 200] [--repeat 5]
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from markdownify import markdownify as md
+from llm_provider.config import CONFIG
+from llm_provider.utils.preprocessing import (
+    HTML_PARSER,
+    clean_html_claude,
+    clean_html_gpt,
+    extract_content,
+)
+
+CODE_LINE = 'def handler_{i}(request):  # <span class="hljs-comment">process {i}</span>'
+
+def make_claude_response(blocks: int) -> str:
+    parts = ['<div class="font-claude-message">']
+    for i in range(blocks):
+        code = '\n'.join(CODE_LINE.format(i=j) for j in range(20))
+        parts.append(f'<p>Step {i}: <strong>explanation</strong> with <code>inline</code> code.</p>')
+        parts.append(
+            '<pre><div><div>python</div><div><code class="language-python">'
+            f'{code}</code></div></div><button>Copy</button></pre>'
+        )
+    parts.append('<div><button aria-label="Preview contents">Preview</button></div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+def make_gpt_response(blocks: int) -> str:
+    parts = ['<div data-message-author-role="assistant">']
+    for i in range(blocks):
+        code = '\n'.join(CODE_LINE.format(i=j) for j in range(20))
+        parts.append(f'<p>Step {i}: <em>explanation</em> with <code>inline</code> code.</p>')
+        parts.append(
+            '<pre class="!overflow-visible"><div><div>python<button aria-label="Copy">Copy</button></div>'
+            f'<div><code class="language-python">{code}</code></div></div></pre>'
+        )
+    parts.append('</div>')
+    return ''.join(parts)
+
+def legacy_claude(html: str) -> dict:
+    soup = BeautifulSoup(html, 'html.parser')
+    target = soup.find('button', {'aria-label': 'Preview contents'})
+    if target and target.parent:
+        target.parent.decompose()
+    html = str(soup)
+    return {'html': html, 'text': soup.text, 'markdown': md(clean_html_claude(html))}
+
+def legacy_gpt(html: str) -> dict:
+    return {'html': html, 'markdown': md(clean_html_gpt(html))}
+
+def timed(func, html: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--blocks', type=int, default=200, help='code blocks per response')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case, best is reported')
+    args = parser.parse_args()
+
+    cases = [
+        ('claude', make_claude_response(args.blocks), legacy_claude, CONFIG['claude']['cleanup_rules']),
+        ('chatgpt', make_gpt_response(args.blocks), legacy_gpt, CONFIG['chatgpt']['cleanup_rules']),
+    ]
+
+    print(f'parser backend: {HTML_PARSER}')
+    print(f'{"provider":<10}{"size":>10}{"legacy (s)":>14}{"one-pass (s)":>14}{"speedup":>10}')
+    for name, html, legacy, rules in cases:
+        legacy_time = timed(legacy, html, args.repeat)
+        engine_time = timed(lambda content: extract_content(content, rules), html, args.repeat)
+        print(
+            f'{name:<10}{len(html):>10}{legacy_time:>14.4f}{engine_time:>14.4f}'
+            f'{legacy_time / engine_time:>9.2f}x'
+        )
+
+if __name__ == '__main__':
+    main()
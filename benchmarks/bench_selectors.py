@@ -0,0 +1,130 @@
+"""Selector benchmark: time every configured locator against a saved page snapshot.
+
+Save a snapshot of a loaded page with ``browser.save_snapshot('chatgpt.html')``, then:
+
+    python -m benchmarks.bench_selectors chatgpt.html --provider chatgpt [--repeat 50] [--slow-ms 1.0] [--browser]
+
+By default XPaths are evaluated with lxml and CSS selectors with lxml's
+cssselect (soupsieve when cssselect is not installed). With ``--browser`` the
+snapshot is opened in headless Chrome and every locator is timed in the page,
+which is closer to what the providers see.
+"""
+import re
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List, Any
+import lxml.html
+from bs4 import BeautifulSoup
+from llm_provider.config import CONFIG
+from llm_provider.browsers.locators import Locator, parse_locator, configured_locators
+from llm_provider.utils.preprocessing import HTML_PARSER
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+POSITIONAL_STEP = re.compile(r'/\w+\[\d+\]')
+
+def is_brittle(strategy: str, value: str) -> bool:
+    """Absolute paths from the document root and chains of positional steps break on any layout change."""
+    return strategy == 'xpath' and (value.startswith('/html') or len(POSITIONAL_STEP.findall(value)) >= 3)
+
+def time_offline(html: str, locators: Dict[str, Locator], repeat: int) -> Dict[str, List[Dict[str, Any]]]:
+    tree = lxml.html.document_fromstring(html)
+    soup = None
+    report = {}
+    for name, locator in locators.items():
+        results = []
+        for strategy, value in parse_locator(locator):
+            if strategy == 'xpath':
+                query = lambda value=value: tree.xpath(value)
+            elif CSSSelector is not None:
+                query = lambda selector=CSSSelector(value): selector(tree)
+            else:
+                if soup is None:
+                    soup = BeautifulSoup(html, HTML_PARSER)
+                query = lambda value=value: soup.select(value)
+
+            samples = []
+            count = 0
+            try:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    count = len(query())
+                    samples.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                results.append({'strategy': strategy, 'value': value, 'error': str(e)})
+                continue
+            results.append({
+                'strategy': strategy,
+                'value': value,
+                'count': count,
+                'median_ms': statistics.median(samples),
+                'best_ms': min(samples)
+            })
+        report[name] = results
+    return report
+
+def time_in_browser(path: str, locators: Dict[str, Locator], repeat: int) -> Dict[str, List[Dict[str, Any]]]:
+    from selenium import webdriver
+    from llm_provider.browsers.base import BaseBrowser
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    browser = BaseBrowser()
+    browser.driver = webdriver.Chrome(options=options)
+    try:
+        browser.driver.get(Path(path).resolve().as_uri())
+        return browser.time_locators(locators, repeat)
+    finally:
+        browser.driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('snapshot', help='HTML snapshot saved with BaseBrowser.save_snapshot()')
+    parser.add_argument('--provider', default='chatgpt', help='config section whose locators are timed')
+    parser.add_argument('--repeat', type=int, default=20, help='evaluations per locator')
+    parser.add_argument('--slow-ms', type=float, default=1.0, help='median above which a locator is reported as slow')
+    parser.add_argument('--browser', action='store_true', help='time in headless Chrome instead of lxml')
+    args = parser.parse_args()
+
+    locators = configured_locators(CONFIG[args.provider])
+    if args.browser:
+        engine = 'chrome'
+        report = time_in_browser(args.snapshot, locators, args.repeat)
+    else:
+        engine = 'lxml' if CSSSelector is not None else 'lxml (xpath) / soupsieve (css)'
+        report = time_offline(Path(args.snapshot).read_text(encoding='utf-8'), locators, args.repeat)
+
+    rows = [(name, index, result) for name, results in report.items() for index, result in enumerate(results)]
+    rows.sort(key=lambda row: row[2].get('median_ms', float('inf')), reverse=True)
+
+    print(f'engine: {engine}, {len(locators)} locators, {args.repeat} runs each')
+    print(f'{"locator":<32}{"strategy":>10}{"matches":>9}{"median ms":>11}{"best ms":>9}  notes')
+    slow = []
+    for name, index, result in rows:
+        label = name if index == 0 else f'{name}[{index}]'
+        notes = []
+        if 'error' in result:
+            print(f'{label:<32}{result["strategy"]:>10}{"-":>9}{"-":>11}{"-":>9}  ERROR {result["error"]}')
+            continue
+        if result['median_ms'] > args.slow_ms:
+            notes.append('SLOW')
+            slow.append(label)
+        if not result['count']:
+            notes.append('MISSING')
+        if is_brittle(result['strategy'], result['value']):
+            notes.append('BRITTLE')
+        print(
+            f'{label:<32}{result["strategy"]:>10}{result["count"]:>9}'
+            f'{result["median_ms"]:>11.3f}{result["best_ms"]:>9.3f}  {" ".join(notes)}'
+        )
+
+    if slow:
+        print(f'\n{len(slow)} locator(s) slower than {args.slow_ms} ms: {", ".join(slow)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Startup benchmark: import cost of the package entry points, measured with ``python -X importtime``.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--top 10] [--budget-ms 400]
+
+Every target is imported in a fresh interpreter so nothing is shared between
+runs; the median cumulative import time of each target is reported along with
+the packages it spends most time in. With ``--budget-ms`` the exit status is non-zero when
+a target exceeds the budget, so it can guard against startup regressions in CI.
+"""
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+TARGETS = [
+    'llm_provider',
+    'llm_provider.browsers',
+    'llm_provider.providers',
+    'llm_provider.browsers.chrome',
+    'llm_provider.providers.chatgpt',
+    'llm_provider.providers.claude',
+    'llm_provider.directors.sora',
+]
+
+# Optional dependencies that should only be imported once they are used
+LAZY_MODULES = ['undetected_chromedriver', 'fake_useragent', 'bs4', 'markdownify', 'yaml']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def import_times(statement: str) -> Tuple[Dict[str, int], Dict[str, int], List[str]]:
+    """Run ``statement`` in a fresh interpreter.
+
+    Returns the cumulative import microseconds by module, the self time summed
+    by top-level package and the names of all loaded modules.
+    """
+    probe = f'{statement}; import sys; print(" ".join(sorted(sys.modules)))'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, check=True
+    )
+    cumulative, packages = {}, {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        if name == 'site':
+            # Everything before is interpreter startup
+            cumulative, packages = {}, {}
+        # importtime only reports the first import of each module
+        cumulative[name] = int(match.group(2))
+        package = name.partition('.')[0]
+        packages[package] = packages.get(package, 0) + int(match.group(1))
+    return cumulative, packages, result.stdout.split()
+
+def construction_times(repeat: int) -> List[float]:
+    """Time picking a Chrome user agent, with the pool built on the first call, in fresh interpreters."""
+    script = (
+        'import time\n'
+        'from llm_provider.browsers.chrome import desktop_chrome_user_agents\n'
+        'for _ in range(2):\n'
+        '    start = time.perf_counter()\n'
+        '    desktop_chrome_user_agents().random\n'
+        '    print((time.perf_counter() - start) * 1000)\n'
+    )
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+        runs.append([float(value) for value in output.split()])
+    return [statistics.median(run[index] for run in runs) for index in range(2)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per target, the median is reported')
+    parser.add_argument('--top', type=int, default=5, help='slowest packages listed per target')
+    parser.add_argument('--budget-ms', type=float, default=None, help='fail when a target imports slower than this')
+    args = parser.parse_args()
+
+    baseline = statistics.median(import_times('pass')[0]['site'] for _ in range(args.repeat))
+    print(f'interpreter site import: {baseline / 1000:.1f} ms (not included below)')
+    print(f'{"target":<34}{"median ms":>11}  eagerly loaded')
+
+    over_budget = []
+    for target in TARGETS:
+        samples = []
+        for _ in range(args.repeat):
+            cumulative, packages, loaded = import_times(f'import {target}')
+            samples.append(cumulative.get(target, 0))
+        total = statistics.median(samples) / 1000
+        eager = [name for name in LAZY_MODULES if name in loaded]
+        print(f'{target:<34}{total:>11.1f}  {", ".join(eager) or "-"}')
+
+        # Slowest packages pulled in by the last run
+        dependencies = sorted(
+            ((time, name) for name, time in packages.items() if name not in ('site', 'llm_provider')),
+            reverse=True
+        )[:args.top]
+        for time, name in dependencies:
+            print(f'    {name:<30}{time / 1000:>11.1f}')
+
+        if args.budget_ms is not None and total > args.budget_ms:
+            over_budget.append(target)
+
+    first, cached = construction_times(args.repeat)
+    print(f'\nChrome user agent: {first:.1f} ms with the first pool build, {cached:.1f} ms once cached')
+
+    if over_budget:
+        print(f'\n{len(over_budget)} target(s) over the {args.budget_ms} ms budget: {", ".join(over_budget)}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,12 @@
-from .chrome import ChromeBrowser
-from .firefox import FirefoxBrowser
-from .edge import EdgeBrowser
-from .base import BaseBrowser
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    'ChromeBrowser': '.chrome',
+    'FirefoxBrowser': '.firefox',
+    'EdgeBrowser': '.edge',
+    'BaseBrowser': '.base',
+    'ChromeSupervisor': '.supervisor',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,152 @@
+import queue
+import asyncio
+import threading
+import weakref
+import functools
+import concurrent.futures
+from typing import Any, Callable, Optional, TypeVar
+from ..utils.deadline import Deadline, use_deadline
+
+T = TypeVar('T')
+
+_STOP = object()
+_END = object()
+
+class DriverActor:
+    """Runs every command for one browser on a single worker thread, in order.
+
+    Selenium drivers are not safe to use from several threads at once, so all
+    async facades of a browser share its actor (see ``actor_for``) and their
+    calls are serialized through its queue. A cancelled call that has not
+    started is dropped; one that is running is stopped at its next browser
+    wait through a cancelled ``Deadline``.
+    """
+
+    def __init__(self, name: str = 'driver-actor'):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            future, deadline, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with use_deadline(deadline):
+                    result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def submit(self, func: Callable[..., T], *args, **kwargs) -> concurrent.futures.Future:
+        """Queue ``func(*args, **kwargs)`` and return a future for its result."""
+        future = concurrent.futures.Future()
+        # Every command runs under its own open-ended deadline so it can be cancelled mid-wait
+        future.deadline = Deadline()
+        self._ensure_started()
+        self._queue.put((future, future.deadline, func, args, kwargs))
+        return future
+
+    async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``func`` on the actor thread without blocking the event loop."""
+        future = self.submit(func, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                future.deadline.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Let the worker finish the queued commands and exit."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(_STOP)
+            self._thread = None
+
+_actors = weakref.WeakKeyDictionary()
+_actors_lock = threading.Lock()
+
+def actor_for(browser) -> DriverActor:
+    """Return the actor shared by everything that drives ``browser``."""
+    with _actors_lock:
+        actor = _actors.get(browser)
+        if actor is None:
+            actor = _actors[browser] = DriverActor(f'{type(browser).__name__}-actor')
+        return actor
+
+class AsyncFacade:
+    """Asyncio wrapper that forwards method calls of a provider or director to its browser's actor.
+
+    Methods of the wrapped object become coroutines, properties become
+    awaitables and plain attributes are returned as they are. Build
+    instances with ``await create(...)`` so the blocking constructor (which
+    opens the start page) also runs on the actor.
+    """
+
+    sync_class = None
+
+    def __init__(self, target: Any, actor: Optional[DriverActor] = None):
+        self._target = target
+        self._actor = actor or actor_for(target.browser)
+
+    @classmethod
+    async def create(cls, browser, config, *args, **kwargs) -> 'AsyncFacade':
+        actor = actor_for(browser)
+        target = await actor.call(cls.sync_class, browser, config, *args, **kwargs)
+        return cls(target, actor)
+
+    @property
+    def sync(self) -> Any:
+        """The wrapped blocking object. Only use it from code running on the actor."""
+        return self._target
+
+    @property
+    def actor(self) -> DriverActor:
+        return self._actor
+
+    def __getattr__(self, name: str):
+        static = getattr(type(self._target), name, None)
+        if isinstance(static, property):
+            return self._actor.call(getattr, self._target, name)
+
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self._actor.call(attribute, *args, **kwargs)
+        return method
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``func(sync_object, *args, **kwargs)`` on the actor, e.g. to batch several calls."""
+        return await self._actor.call(func, self._target, *args, **kwargs)
+
+    async def iterate(self, method: str, *args, **kwargs):
+        """Drive a generator method of the wrapped object on the actor, one item per call."""
+        iterator = await self._actor.call(getattr(self._target, method), *args, **kwargs)
+        while True:
+            item = await self._actor.call(next, iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+    async def close_browser(self) -> None:
+        """Close the browser on the actor and stop the actor thread."""
+        try:
+            await self._actor.call(self._target.browser.close)
+        finally:
+            self._actor.stop()
@@ -1,25 +1,215 @@
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Callable, Iterable, TypeVar
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
+from ..utils.pacing import PacingPolicy
+from ..utils.deadline import DeadlineExceeded, bounded_timeout, current_deadline
+from .waiting import wait_until, retry, first_of
+from .locators import Locator, by_pairs, script_locator, locator_key, describe
+from .scripts import (
+    RESPONSE_OBSERVER_JS,
+    RESPONSE_STATE_JS,
+    WAIT_RESPONSE_STATE_JS,
+    READ_RESPONSE_DELTA_JS,
+    SNAPSHOT_ELEMENTS_JS,
+    INSERT_TEXT_JS,
+    READINESS_JS,
+    LOCATOR_SIGNATURE_JS,
+    TIME_LOCATORS_JS,
+    PROBE_LOCATORS_JS,
+    FIND_MARKED_JS,
+    MEMORY_METRICS_JS,
+    READ_MESSAGES_JS
+)
+
+T = TypeVar('T')
 
 class BaseBrowser(ABC):
     """Base class for browser interactions with enhanced error handling and typing."""
     
-    def __init__(self):
+    # Adaptive polling: first check after 50 ms, backing off to 500 ms
+    poll_initial_interval = 0.05
+    poll_max_interval = 0.5
+    poll_backoff = 1.5
+
+    def __init__(self, pacing: Optional[PacingPolicy] = None):
         self.driver = None
+        self.pacing = pacing or PacingPolicy.from_config()
+        # Hot locators whose resolved elements are reused until they go stale
+        self.cached_locators = set()
+        self._locator_cache = {}
+        # Window handle made active through switch_to_tab/open_tab, with the
+        # locator caches of the inactive tabs
+        self.current_tab = None
+        self._tab_locator_caches = {}
+        self.locator_stats = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0}
+
+    def pause(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> float:
+        """Sleep for the pacing policy's budget of ``operation``."""
+        return self.pacing.delay(operation, min_delay, max_delay)
     
-    def wait_presence(self, xpath: str, timeout: int = 3) -> bool:
-        """Wait for element presence with explicit typing and error handling."""
+    def wait_for(
+        self,
+        condition: Callable[[], T],
+        timeout: float = 10,
+        max_interval: Optional[float] = None
+    ) -> Optional[T]:
+        """Poll ``condition`` adaptively, returning its value or None on timeout.
+
+        Raises ``DeadlineExceeded`` when the active deadline runs out first.
+        """
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
+            return wait_until(
+                condition,
+                timeout,
+                initial_interval=self.poll_initial_interval,
+                max_interval=max_interval or self.poll_max_interval,
+                backoff=self.poll_backoff
             )
+        except DeadlineExceeded:
+            raise
+        except TimeoutException:
+            return None
+
+    def _wait(self, condition, timeout: float, message: str = ''):
+        return wait_until(
+            lambda: condition(self.driver),
+            timeout,
+            initial_interval=self.poll_initial_interval,
+            max_interval=self.poll_max_interval,
+            backoff=self.poll_backoff,
+            message=message
+        )
+
+    def cache_locators(self, locators: Iterable[Locator]) -> None:
+        """Keep the elements resolved for ``locators`` and reuse them while they are valid."""
+        self.cached_locators.update(locator_key(locator) for locator in locators)
+
+    def invalidate_locators(self, locator: Optional[Locator] = None) -> None:
+        """Drop the cached element for ``locator``, or every cached element."""
+        if locator is None:
+            if self._locator_cache:
+                self.locator_stats['invalidations'] += 1
+            self._locator_cache.clear()
+        elif self._locator_cache.pop(locator_key(locator), None) is not None:
+            self.locator_stats['invalidations'] += 1
+
+    def get_locator_stats(self) -> Dict[str, Any]:
+        stats = dict(self.locator_stats)
+        stats['entries'] = len(self._locator_cache)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _active_handle(self) -> Optional[str]:
+        """Handle of the window the locator cache belongs to, None when no window is active."""
+        if self.current_tab is not None:
+            return self.current_tab
+        try:
+            return self.driver.current_window_handle
+        except WebDriverException:
+            # The active window was closed
+            return None
+
+    def _activate_tab(self, handle: str, previous: Optional[str]) -> None:
+        if previous != handle:
+            if previous is not None:
+                self._tab_locator_caches[previous] = self._locator_cache
+            self._locator_cache = self._tab_locator_caches.pop(handle, {})
+        self.current_tab = handle
+
+    def switch_to_tab(self, handle: str) -> None:
+        """Make ``handle`` the active window, skipping the round trip when it already is."""
+        if handle == self.current_tab:
+            return
+        previous = self._active_handle()
+        self.driver.switch_to.window(handle)
+        self._activate_tab(handle, previous)
+
+    def open_tab(self) -> str:
+        """Open a blank tab, make it active and return its handle."""
+        previous = self._active_handle()
+        self.driver.switch_to.new_window('tab')
+        handle = self.driver.current_window_handle
+        self._activate_tab(handle, previous)
+        return handle
+
+    def recycle_tab(self) -> Optional[str]:
+        """Replace the active tab with a blank one in a fresh renderer; returns the new handle."""
+        try:
+            old_handle = self.current_tab or self.driver.current_window_handle
+            handle = self.open_tab()
+            self.close_tab(old_handle)
+            self.switch_to_tab(handle)
+            return handle
+        except WebDriverException as e:
+            print(f"Browser error recycling tab: {e}")
+            return None
+
+    def close_tab(self, handle: str) -> None:
+        """Close the tab ``handle``; the active tab is undefined afterwards until the next switch."""
+        self.switch_to_tab(handle)
+        self.driver.close()
+        self._locator_cache = {}
+        self.current_tab = None
+
+    def _cached_element(self, key, wait_type: str) -> Optional[WebElement]:
+        entry = self._locator_cache.get(key)
+        if entry is None:
+            self.locator_stats['misses'] += 1
+            return None
+        element, signature = entry
+        try:
+            current = self.driver.execute_script(LOCATOR_SIGNATURE_JS, element, wait_type)
+        except WebDriverException:
+            # StaleElementReferenceException or a replaced document
+            current = None
+        if current is None or current != signature:
+            del self._locator_cache[key]
+            self.locator_stats['stale'] += 1
+            self.locator_stats['misses'] += 1
+            return None
+        self.locator_stats['hits'] += 1
+        return element
+
+    def _remember_element(self, key, element: WebElement) -> None:
+        try:
+            signature = self.driver.execute_script(LOCATOR_SIGNATURE_JS, element, 'presence')
+        except WebDriverException:
+            return
+        if signature is not None:
+            self._locator_cache[key] = (element, signature)
+
+    def _condition(self, factory, locator: Locator):
+        """Build the expected condition ``factory`` for every fallback of ``locator``."""
+        conditions = [factory(pair) for pair in by_pairs(locator)]
+        return conditions[0] if len(conditions) == 1 else first_of(*conditions)
+
+    def locate(self, locator: Locator, root: Optional[WebElement] = None) -> Optional[WebElement]:
+        """Return the first element matched by ``locator`` right now, without waiting."""
+        elements = self.locate_all(locator, root)
+        return elements[0] if elements else None
+
+    def locate_all(self, locator: Locator, root: Optional[WebElement] = None) -> List[WebElement]:
+        """Return the elements of the first fallback of ``locator`` that matches, without waiting."""
+        context = root if root is not None else self.driver
+        for by, value in by_pairs(locator):
+            elements = context.find_elements(by, value)
+            if elements:
+                return elements
+        return []
+
+    def wait_presence(self, locator: Locator, timeout: int = 3) -> bool:
+        """Wait for element presence with explicit typing and error handling."""
+        try:
+            self._wait(self._condition(EC.presence_of_element_located, locator), timeout, f'waiting for {describe(locator)}')
             return True
+        except DeadlineExceeded:
+            raise
         except TimeoutException:
             return False
         except WebDriverException as e:
@@ -28,11 +218,21 @@ class BaseBrowser(ABC):
 
     def find_element(
         self, 
-        xpath: str, 
+        locator: Locator, 
         timeout: int = 10,
         wait_type: str = "presence"
     ) -> Optional[WebElement]:
-        """Find element with multiple wait conditions and error handling."""
+        """Find element with multiple wait conditions and error handling.
+
+        Elements of ``cached_locators`` come from the locator cache when they
+        are still attached and unchanged.
+        """
+        key = locator_key(locator)
+        cached = key in self.cached_locators
+        if cached:
+            element = self._cached_element(key, wait_type)
+            if element is not None:
+                return element
         try:
             wait_conditions = {
                 "presence": EC.presence_of_element_located,
@@ -40,11 +240,14 @@ class BaseBrowser(ABC):
                 "visible": EC.visibility_of_element_located
             }
             condition = wait_conditions.get(wait_type, EC.presence_of_element_located)
-            return WebDriverWait(self.driver, timeout).until(
-                condition((By.XPATH, xpath))
-            )
+            element = self._wait(self._condition(condition, locator), timeout, f'waiting for {describe(locator)}')
+            if cached:
+                self._remember_element(key, element)
+            return element
+        except DeadlineExceeded:
+            raise
         except TimeoutException:
-            print(f"Timeout waiting for element: {xpath}")
+            print(f"Timeout waiting for element: {describe(locator)}")
             return None
         except WebDriverException as e:
             print(f"Browser error finding element: {e}")
@@ -52,17 +255,20 @@ class BaseBrowser(ABC):
 
     def find_elements(
         self, 
-        xpath: str, 
+        locator: Locator, 
         timeout: int = 10
     ) -> List[WebElement]:
         """Find multiple elements with error handling."""
         try:
-            elements = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located((By.XPATH, xpath))
+            return self._wait(
+                self._condition(EC.presence_of_all_elements_located, locator),
+                timeout,
+                f'waiting for {describe(locator)}'
             )
-            return elements
+        except DeadlineExceeded:
+            raise
         except TimeoutException:
-            print(f"Timeout waiting for elements: {xpath}")
+            print(f"Timeout waiting for elements: {describe(locator)}")
             return []
         except WebDriverException as e:
             print(f"Browser error finding elements: {e}")
@@ -70,70 +276,464 @@ class BaseBrowser(ABC):
 
     def click_element(
         self, 
-        xpath: str, 
+        locator: Locator, 
         timeout: int = 10,
-        retry_count: int = 2
+        retry_count: int = 2,
+        retry_delay: float = 0.1
     ) -> bool:
-        """Click element with retry mechanism and error handling."""
-        for attempt in range(retry_count):
+        """Click element, re-resolving it and backing off with jitter between attempts."""
+        def attempt(_: int) -> bool:
+            # Resolve on every attempt so a stale element is looked up again
+            element = self.find_element(locator, timeout, wait_type="clickable")
+            if not element:
+                raise TimeoutException(f"Element not clickable: {describe(locator)}")
             try:
-                element = self.find_element(xpath, timeout, wait_type="clickable")
-                if element:
-                    element.click()
-                    return True
-                time.sleep(0.5)
-            except WebDriverException as e:
-                if attempt == retry_count - 1:
-                    print(f"Failed to click element after {retry_count} attempts: {e}")
-                    return False
-        return False
+                element.click()
+            except StaleElementReferenceException:
+                self.invalidate_locators(locator)
+                raise
+            return True
+
+        try:
+            return retry(attempt, attempts=retry_count, base_delay=retry_delay)
+        except DeadlineExceeded:
+            raise
+        except WebDriverException as e:
+            print(f"Failed to click element after {retry_count} attempts: {e}")
+            return False
 
     def send_keys(
         self, 
-        xpath: str, 
+        locator: Locator, 
         keys: str,
         clear_first: bool = True
     ) -> bool:
         """Send keys to element with optional clearing."""
-        try:
-            element = self.find_element(xpath)
-            if element:
+        def attempt(_: int) -> bool:
+            element = self.find_element(locator)
+            if not element:
+                return False
+            try:
                 if clear_first:
                     element.clear()
                 element.send_keys(keys)
-                return True
-            return False
+            except StaleElementReferenceException:
+                self.invalidate_locators(locator)
+                raise
+            return True
+
+        try:
+            return retry(attempt, attempts=2, retry_on=(StaleElementReferenceException,))
+        except DeadlineExceeded:
+            raise
         except WebDriverException as e:
             print(f"Error sending keys to element: {e}")
             return False
 
+    def insert_text(
+        self,
+        locator: Locator,
+        text: str,
+        verify: bool = True
+    ) -> bool:
+        """Replace the element content with multi-line text in one operation.
+
+        With ``verify`` the non-blank lines of the element content must match
+        the non-blank lines of ``text``.
+        """
+        element = self.find_element(locator)
+        if not element:
+            return False
+        try:
+            content = self.driver.execute_script(INSERT_TEXT_JS, element, text)
+        except WebDriverException as e:
+            self.invalidate_locators(locator)
+            print(f"Error inserting text into element: {e}")
+            return False
+        if not verify:
+            return True
+
+        def lines(value: Optional[str]) -> List[str]:
+            return [line.strip() for line in (value or '').splitlines() if line.strip()]
+        return lines(content) == lines(text)
+
     def is_element_present(
         self, 
-        xpath: str, 
+        locator: Locator, 
         timeout: int = 10
     ) -> bool:
         """Check element presence with explicit timeout."""
-        return self.wait_presence(xpath, timeout)
+        return self.wait_presence(locator, timeout)
 
     def get_element_text(
         self, 
-        xpath: str, 
+        locator: Locator, 
         timeout: int = 10
     ) -> Optional[str]:
         """Get element text with error handling."""
-        element = self.find_element(xpath, timeout)
+        element = self.find_element(locator, timeout)
         if element:
             return element.text
         return None
 
     def get_element_attribute(
         self, 
-        xpath: str, 
+        locator: Locator, 
         attribute: str, 
         timeout: int = 10
     ) -> Optional[str]:
         """Get element attribute with error handling."""
-        element = self.find_element(xpath, timeout)
+        element = self.find_element(locator, timeout)
         if element:
             return element.get_attribute(attribute)
-        return None
\ No newline at end of file
+        return None
+
+    def install_response_observer(
+        self,
+        message_locator: Locator,
+        streaming_locator: Optional[Locator] = None,
+        id_attribute: Optional[str] = None
+    ) -> bool:
+        """Install the in-page MutationObserver used for cheap response state probes."""
+        try:
+            return bool(self.driver.execute_script(
+                RESPONSE_OBSERVER_JS,
+                script_locator(message_locator),
+                script_locator(streaming_locator) if streaming_locator else [],
+                id_attribute or ''
+            ))
+        except WebDriverException as e:
+            print(f"Browser error installing response observer: {e}")
+            return False
+
+    def get_response_state(self, completion_locator: Optional[Locator] = None) -> Optional[Dict[str, Any]]:
+        """Probe the latest message id, streaming flag, text length and hash.
+
+        ``ready`` in the result tells whether ``completion_locator`` is present.
+        """
+        try:
+            return self.driver.execute_script(
+                RESPONSE_STATE_JS,
+                script_locator(completion_locator) if completion_locator else []
+            )
+        except WebDriverException as e:
+            print(f"Browser error probing response state: {e}")
+            return None
+
+    def wait_for_response_state(
+        self,
+        previous_id: Optional[str] = None,
+        completion_locator: Optional[Locator] = None,
+        timeout: float = 300,
+        settle: float = 0.5,
+        slice_timeout: float = 1.5
+    ) -> Optional[Dict[str, Any]]:
+        """Wait in short async script slices until the observed response completes.
+
+        The active deadline is checked between slices, so a cancelled call
+        stops within ``slice_timeout``. Returns the final state with a
+        ``complete`` flag, or None when the observer is missing or the script
+        failed. Raises ``DeadlineExceeded`` when the active deadline ends
+        before the response does.
+        """
+        deadline = current_deadline()
+        budget = bounded_timeout(timeout)
+        end_time = time.monotonic() + budget
+        state = None
+        try:
+            previous_timeout = self.driver.timeouts.script
+            self.driver.set_script_timeout(slice_timeout + 5)
+        except WebDriverException as e:
+            print(f"Browser error waiting for response state: {e}")
+            return None
+        try:
+            while True:
+                if deadline is not None and deadline.cancelled:
+                    raise deadline.exceeded('waiting for the response to complete')
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    if budget < timeout:
+                        raise deadline.exceeded('waiting for the response to complete')
+                    return state
+                state = self.driver.execute_async_script(
+                    WAIT_RESPONSE_STATE_JS,
+                    previous_id,
+                    script_locator(completion_locator) if completion_locator else [],
+                    int(settle * 1000),
+                    int(min(slice_timeout, remaining) * 1000)
+                )
+                if not state or state.get('complete'):
+                    return state
+        except DeadlineExceeded:
+            raise
+        except WebDriverException as e:
+            print(f"Browser error waiting for response state: {e}")
+            return None
+        finally:
+            if previous_timeout is not None:
+                try:
+                    self.driver.set_script_timeout(previous_timeout)
+                except WebDriverException:
+                    pass
+
+    def read_response_delta(
+        self,
+        previous_id: Optional[str] = None,
+        completion_locator: Optional[Locator] = None,
+        settle: float = 0.5
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch only the text appended to the observed message since the last read.
+
+        ``reset`` is set, with the full ``text``, when earlier text was re-rendered.
+        """
+        try:
+            return self.driver.execute_script(
+                READ_RESPONSE_DELTA_JS,
+                previous_id,
+                script_locator(completion_locator) if completion_locator else [],
+                int(settle * 1000)
+            )
+        except WebDriverException as e:
+            print(f"Browser error reading response delta: {e}")
+            return None
+
+
+    def snapshot_elements(
+        self,
+        selector: Locator,
+        by: str = "xpath",
+        title_xpath: Optional[Locator] = None,
+        id_attribute: Optional[str] = None,
+        include_text: bool = True,
+        root: Optional[WebElement] = None
+    ) -> List[Dict[str, Optional[str]]]:
+        """Extract href, title, id and text for all matching elements in one script call.
+
+        ``by`` is the strategy of unprefixed selectors.
+        """
+        try:
+            return self.driver.execute_script(
+                SNAPSHOT_ELEMENTS_JS,
+                script_locator(selector, by),
+                script_locator(title_xpath) if title_xpath else [],
+                id_attribute or '',
+                include_text,
+                root
+            ) or []
+        except WebDriverException as e:
+            print(f"Browser error taking element snapshot: {e}")
+            return []
+
+    def read_messages(
+        self,
+        locator: Locator,
+        id_attribute: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Read the messages from ``cursor`` (inclusive) onwards in one script call.
+
+        Returns ``{'messages': [{'key', 'text'}], 'count', 'cursor_found'}``;
+        every message is returned when ``cursor`` is None or not on the page.
+        """
+        try:
+            return self.driver.execute_script(READ_MESSAGES_JS, script_locator(locator), id_attribute or '', cursor)
+        except WebDriverException as e:
+            print(f"Browser error reading messages: {e}")
+            return None
+
+    def wait_until_ready(
+        self,
+        locators: Optional[List[Locator]] = None,
+        min_wait: float = 0,
+        max_wait: float = 30,
+        idle: float = 0.5,
+        interval: float = 0.25
+    ) -> bool:
+        """Wait until the page is loaded, all ``locators`` are present and the network is idle.
+
+        Waits at least ``min_wait`` and at most ``max_wait`` seconds.
+        """
+        locators = list(locators or [])
+        script_locators = [script_locator(locator) for locator in locators]
+        start_time = time.time()
+        last_state = {'missing': list(range(len(locators)))}
+
+        def ready():
+            try:
+                state = self.driver.execute_script(READINESS_JS, script_locators, int(idle * 1000))
+            except WebDriverException:
+                # The document may be swapped while navigating
+                return False
+            if not state:
+                return False
+            last_state['missing'] = state['missing']
+            return state['ready'] and time.time() - start_time >= min_wait
+
+        if self.wait_for(ready, timeout=max_wait, max_interval=interval):
+            return True
+        missing = [describe(locators[index]) for index in last_state['missing']]
+        print(f"Page not ready after {max_wait}s, missing: {missing}")
+        return False
+
+    def probe_locators(self, locators: Dict[str, Locator]) -> Dict[str, List[int]]:
+        """Count the matches of each fallback of every locator in a single script call.
+
+        Invalid selectors count as -1. Returns {} when the script failed.
+        """
+        try:
+            return self.driver.execute_script(
+                PROBE_LOCATORS_JS,
+                {name: script_locator(locator) for name, locator in locators.items()}
+            ) or {}
+        except WebDriverException as e:
+            print(f"Browser error probing locators: {e}")
+            return {}
+
+    def check_locators(self, locators: Dict[str, Locator]) -> Dict[str, Dict[str, Any]]:
+        """Report presence, match count and the first matching fallback of every locator."""
+        parsed, report = {}, {}
+        for name, locator in locators.items():
+            try:
+                script_locator(locator)
+                parsed[name] = locator
+            except ValueError as e:
+                report[name] = {'present': False, 'count': 0, 'match': None, 'error': str(e)}
+
+        counts = self.probe_locators(parsed)
+        for name in parsed:
+            fallbacks = counts.get(name, [])
+            match = next((index for index, count in enumerate(fallbacks) if count > 0), None)
+            report[name] = {
+                'present': match is not None,
+                'count': fallbacks[match] if match is not None else 0,
+                'match': match
+            }
+            invalid = [index for index, count in enumerate(fallbacks) if count < 0]
+            if invalid:
+                report[name]['error'] = f'invalid selector at fallback {invalid}'
+        return report
+
+    def find_marked(self, locators: Dict[str, Locator], marker: str) -> Optional[str]:
+        """Name of the first locator whose element contains a ``marker`` (CSS) node, in one script call."""
+        try:
+            return self.driver.execute_script(
+                FIND_MARKED_JS,
+                {name: script_locator(locator) for name, locator in locators.items()},
+                marker
+            )
+        except WebDriverException as e:
+            print(f"Browser error reading marked element: {e}")
+            return None
+
+    def save_snapshot(self, path: str) -> bool:
+        """Write the current DOM to ``path``, e.g. for the selector benchmark."""
+        try:
+            html = self.driver.execute_script('return document.documentElement.outerHTML;')
+        except WebDriverException as e:
+            print(f"Browser error taking page snapshot: {e}")
+            return False
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'<!DOCTYPE html>\n{html}')
+        return True
+
+    def time_locators(self, locators: Dict[str, Locator], repeat: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Time each fallback of every locator in the current page."""
+        try:
+            return self.driver.execute_script(
+                TIME_LOCATORS_JS,
+                {name: script_locator(locator) for name, locator in locators.items()},
+                repeat
+            ) or {}
+        except WebDriverException as e:
+            print(f"Browser error timing locators: {e}")
+            return {}
+
+    def navigate(
+        self,
+        url: str,
+        ready_locators: Optional[List[Locator]] = None,
+        min_wait: float = 0,
+        max_wait: float = 30
+    ) -> bool:
+        """Open ``url`` and gate on readiness instead of sleeping a fixed time."""
+        self.invalidate_locators()
+        try:
+            self.driver.get(url)
+        except WebDriverException as e:
+            print(f"Browser error navigating to {url}: {e}")
+            return False
+        return self.wait_until_ready(ready_locators, min_wait=min_wait, max_wait=max_wait)
+
+    def is_responsive(self) -> bool:
+        """Whether the driver still answers a trivial script."""
+        try:
+            return self.driver.execute_script('return document.readyState;') is not None
+        except WebDriverException:
+            return False
+
+    def browser_processes(self) -> List[Any]:
+        """``psutil`` processes of the browser, its renderers included. Empty without psutil."""
+        try:
+            import psutil
+        except ImportError:
+            return []
+
+        roots = []
+        try:
+            # undetected_chromedriver launches the browser itself
+            browser_pid = getattr(self.driver, 'browser_pid', None)
+            service = getattr(self.driver, 'service', None)
+            if browser_pid:
+                roots.append(psutil.Process(browser_pid))
+            elif getattr(service, 'process', None) is not None:
+                roots.extend(psutil.Process(service.process.pid).children())
+
+            # Attached browsers are not our children, find them by their debugging port
+            debugger_address = (self.driver.capabilities.get('goog:chromeOptions') or {}).get('debuggerAddress')
+            if not roots and debugger_address:
+                flag = f'--remote-debugging-port={debugger_address.rpartition(":")[2]}'
+                for process in psutil.process_iter(['cmdline']):
+                    cmdline = process.info['cmdline'] or []
+                    if flag in cmdline and not any(arg.startswith('--type=') for arg in cmdline):
+                        roots.append(process)
+        except (psutil.Error, WebDriverException):
+            return []
+
+        processes = []
+        for root in roots:
+            try:
+                processes.append(root)
+                processes.extend(root.children(recursive=True))
+            except psutil.Error:
+                continue
+        return processes
+
+    def get_process_rss(self) -> Optional[int]:
+        """Resident memory of all browser processes in bytes, None when it cannot be measured."""
+        processes = self.browser_processes()
+        if not processes:
+            return None
+        import psutil
+        rss = None
+        for process in processes:
+            try:
+                rss = (rss or 0) + process.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss
+
+    def get_memory_metrics(self) -> Optional[Dict[str, Any]]:
+        """JS heap and DOM node count of the active tab, and the RSS of all browser processes.
+
+        Values that cannot be measured (e.g. RSS without psutil) are None.
+        """
+        try:
+            metrics = self.driver.execute_script(MEMORY_METRICS_JS)
+        except WebDriverException as e:
+            print(f"Browser error reading memory metrics: {e}")
+            return None
+        if not metrics:
+            return None
+        # Left None without psutil, limits on it are then skipped
+        metrics['rss_bytes'] = self.get_process_rss()
+        return metrics
@@ -1,74 +1,270 @@
-import time
 import json
 import random
+import functools
+import urllib.error
+import urllib.request
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-import undetected_chromedriver as uc
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from typing import Optional
-from fake_useragent import UserAgent
+from selenium.common.exceptions import WebDriverException
+from typing import Optional, Dict, List, Any
 from ..utils.browser_utils import get_profile_paths
 from ..config import CONFIG
+from ..utils.pacing import PacingPolicy
 from .base import BaseBrowser
 
+@functools.lru_cache(maxsize=None)
+def desktop_chrome_user_agents():
+    """Build the filtered UserAgent dataset once per process, it is shared by every ChromeBrowser."""
+    from fake_useragent import UserAgent
+    return UserAgent(browsers='Chrome', platforms='desktop', min_version=120.0)
+
+# Basic anti-detection options
+STEALTH_ARGUMENTS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--disable-dev-shm-usage',
+    '--disable-browser-side-navigation',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+]
+
+WINDOW_SIZES = [(1366, 768), (1920, 1080), (1536, 864), (1440, 900)]
+
+# URL patterns blocked for the resource types of a launch profile's blocked_resource_types.
+# SVG is left alone, providers locate some controls by their icons.
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.ico'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.m4a', '*.mp3', '*.ogg', '*.wav', '*.m3u8'],
+}
+
+def launch_profile_arguments(profile: Dict[str, Any]) -> List[str]:
+    """Chrome flags of a ``chrome.launch_profiles`` entry, headless mode excluded."""
+    arguments = []
+    if profile.get('block_images'):
+        arguments.append('--blink-settings=imagesEnabled=false')
+    if profile.get('max_renderer_memory_mb'):
+        arguments.append(f'--js-flags=--max-old-space-size={int(profile["max_renderer_memory_mb"])}')
+    if profile.get('renderer_process_limit'):
+        arguments.append(f'--renderer-process-limit={int(profile["renderer_process_limit"])}')
+    arguments.extend(profile.get('arguments', []))
+    return arguments
+
+def blocked_url_patterns(profile: Dict[str, Any]) -> List[str]:
+    """URL patterns a launch profile blocks through ``Network.setBlockedURLs``."""
+    patterns = []
+    for resource_type in profile.get('blocked_resource_types', []):
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            print(f'Unknown resource type to block: {resource_type}')
+            continue
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(profile.get('blocked_urls', []))
+    return patterns
+
+def launch_arguments(
+    user_agent: str,
+    proxy: Optional[str] = None,
+    user_data_dir: Optional[str] = None,
+    profile_directory: Optional[str] = None,
+    launch_profile: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """Command line of a ChromeBrowser launch, shared with ChromeSupervisor."""
+    arguments = STEALTH_ARGUMENTS + [f'--user-agent={user_agent}']
+    arguments.extend(launch_profile_arguments(launch_profile or {}))
+
+    # Add proxy if provided
+    if proxy:
+        arguments.append(f'--proxy-server={proxy}')
+
+    # Random window size to avoid detection
+    width, height = random.choice(WINDOW_SIZES)
+    arguments.append(f'--window-size={width},{height}')
+
+    if user_data_dir:
+        arguments.append(f'--user-data-dir={user_data_dir}')
+        arguments.append(f'--profile-directory={profile_directory}')
+    return arguments
+
+class _AttachedRemote(webdriver.Remote):
+    """Remote driver bound to an existing WebDriver session instead of creating one."""
+
+    def __init__(self, executor_url: str, session_id: str):
+        self._attach_session_id = session_id
+        super().__init__(command_executor=executor_url, options=ChromeOptions())
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
 class ChromeBrowser(BaseBrowser):
-    def __init__(self, proxy: Optional[str] = None):
-        super().__init__()
+    """Chrome driven through undetected_chromedriver or plain Selenium.
+
+    By default every instance launches its own Chrome. Pass
+    ``debugger_address`` (or set ``chrome.debugger_address``) to attach to a
+    Chrome started with ``--remote-debugging-port``, e.g. by
+    ``ChromeSupervisor``, or ``session`` (as returned by ``session_info()``) to
+    reuse a WebDriver session of a driver server that outlives this process.
+    Attached browsers are left running by ``close()``.
+
+    ``launch_profile`` picks an entry of ``chrome.launch_profiles``: ``lean``
+    blocks images, fonts, media and trackers and caps renderer memory, which
+    is all the chat providers need; Sora needs the media-enabled ``default``.
+    """
+
+    def __init__(
+        self,
+        proxy: Optional[str] = None,
+        pacing: Optional[PacingPolicy] = None,
+        debugger_address: Optional[str] = None,
+        session: Optional[Dict[str, str]] = None,
+        user_data_dir: Optional[str] = None,
+        profile_directory: Optional[str] = None,
+        launch_profile: Optional[str] = None
+    ):
+        super().__init__(pacing)
         self.browser_name = 'chrome'
         self.chrome_config = CONFIG[self.browser_name]
         self.use_undetected = self.chrome_config.get('use_undetected', True)
         self.user_data_dir, self.profile_directory = get_profile_paths(self.browser_name)
-        
-        self.user_agents = UserAgent(browsers='Chrome', platforms='desktop', min_version=120.0)
+        # Explicit profiles, e.g. one per browser of a BrowserPool, are used even without load_profile
+        self.explicit_profile = bool(user_data_dir or profile_directory)
+        self.user_data_dir = user_data_dir or self.user_data_dir
+        self.profile_directory = profile_directory or self.profile_directory
+        self.debugger_address = debugger_address or self.chrome_config.get('debugger_address') or None
+        self.attached = bool(session or self.debugger_address)
+        self.launch_profile_name = launch_profile or self.chrome_config.get('launch_profile', 'default')
+        launch_profiles = self.chrome_config.get('launch_profiles', {})
+        if self.launch_profile_name not in launch_profiles:
+            print(f'Unknown launch profile {self.launch_profile_name}, using Chrome defaults')
+        self.launch_profile = launch_profiles.get(self.launch_profile_name) or {}
+        self.blocked_urls = blocked_url_patterns(self.launch_profile)
+
+        if session:
+            self.driver = self._attach_session(session)
+        elif self.debugger_address:
+            self.driver = self._attach(self.debugger_address)
+        else:
+            self.driver = self._launch(proxy)
+
+        self.apply_request_blocking()
+        # Execute anti-detection scripts
+        self._inject_anti_detection_scripts()
+
+    def _launch(self, proxy: Optional[str]):
+        self.user_agents = desktop_chrome_user_agents()
         self.user_agent = self.user_agents.random
-        
+
         if self.use_undetected:
+            # undetected_chromedriver takes ~0.5s to import, only pay for it when used
+            import undetected_chromedriver as uc
             options = uc.ChromeOptions()
         else:
             options = ChromeOptions()
 
-        # Basic anti-detection options
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-browser-side-navigation')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-setuid-sandbox')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-        options.add_argument(f'user-agent={self.user_agent}')
-        
-        # Add proxy if provided
-        if proxy:
-            options.add_argument(f'--proxy-server={proxy}')
-        
-        # Random window size to avoid detection
-        window_sizes = [(1366, 768), (1920, 1080), (1536, 864), (1440, 900)]
-        random_window_size = random.choice(window_sizes)
-        options.add_argument(f"--window-size={random_window_size[0]},{random_window_size[1]}")
-        
         # Load profile if configured
-        if self.chrome_config.get('load_profile', True):
-            options.add_argument(f'--user-data-dir={self.user_data_dir}')
-            options.add_argument(f'--profile-directory={self.profile_directory}')
-
+        if self.chrome_config.get('load_profile', True) or self.explicit_profile:
+            profile = (self.user_data_dir, self.profile_directory)
             print(f'--user-data-dir={self.user_data_dir}')
             print(f'--profile-directory={self.profile_directory}')
-        
+        else:
+            profile = (None, None)
+        for argument in launch_arguments(self.user_agent, proxy, *profile, self.launch_profile):
+            options.add_argument(argument)
+
         # Additional options to mask automation
         self._add_experimental_options(options)
-        
+
+        headless = self.launch_profile.get('headless', False)
         if self.use_undetected:
-            self.driver = uc.Chrome(options=options)
-        else:
-            self.driver = webdriver.Chrome(options=options)
-        
-        # Execute anti-detection scripts
-        self._inject_anti_detection_scripts()
-    
+            return uc.Chrome(options=options, headless=headless)
+        if headless:
+            options.add_argument('--headless=new')
+        return webdriver.Chrome(options=options)
+
+    def _attach_session(self, session: Dict[str, str]):
+        """Reuse ``session``, falling back to ``debugger_address`` when its driver server is gone."""
+        executor_url = session['executor_url'].rstrip('/')
+        problem = None
+        try:
+            with urllib.request.urlopen(f'{executor_url}/status', timeout=2):
+                pass
+            with urllib.request.urlopen(f'{executor_url}/session/{session["session_id"]}/url', timeout=5):
+                pass
+        except urllib.error.HTTPError as e:
+            problem = f'session {session["session_id"]} no longer exists on {executor_url} (HTTP {e.code})'
+        except (OSError, ValueError) as e:
+            problem = f'no chromedriver answers at {executor_url} ({e}); sessions only live as long as the chromedriver that created them'
+
+        if problem is None:
+            return _AttachedRemote(executor_url, session['session_id'])
+        if self.debugger_address:
+            print(f'Cannot reuse WebDriver session: {problem}, attaching to {self.debugger_address} instead')
+            return self._attach(self.debugger_address)
+        raise RuntimeError(f'Cannot reuse WebDriver session: {problem}')
+
+    def _attach(self, debugger_address: str):
+        """Connect a new chromedriver to the Chrome listening on ``debugger_address``."""
+        options = ChromeOptions()
+        options.debugger_address = debugger_address
+        service = None
+        if self.use_undetected:
+            # uc.Chrome always launches a browser, but its patched chromedriver can attach
+            import undetected_chromedriver as uc
+            patcher = uc.Patcher()
+            patcher.auto()
+            service = ChromeService(patcher.executable_path)
+        print(f'Attaching to Chrome at {debugger_address}')
+        return webdriver.Chrome(options=options, service=service)
+
+    def apply_request_blocking(self) -> bool:
+        """Block the launch profile's URL patterns in the active tab. DevTools settings are per tab."""
+        if not self.blocked_urls:
+            return True
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+            return True
+        except (WebDriverException, AttributeError) as e:
+            # Reused remote sessions have no DevTools access
+            print(f'Could not block requests: {e}')
+            return False
+
+    def open_tab(self) -> str:
+        handle = super().open_tab()
+        self.apply_request_blocking()
+        return handle
+
+    def get_performance_metrics(self) -> Optional[Dict[str, float]]:
+        """DevTools ``Performance.getMetrics`` of the active tab (``JSHeapUsedSize``, ``Nodes``, ...)."""
+        try:
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+            result = self.driver.execute_cdp_cmd('Performance.getMetrics', {})
+        except (WebDriverException, AttributeError) as e:
+            print(f'Could not read performance metrics: {e}')
+            return None
+        return {metric['name']: metric['value'] for metric in result.get('metrics', [])}
+
+    def session_info(self) -> Dict[str, str]:
+        """Executor URL and session id that let another process reuse this session.
+
+        The session lives in the chromedriver process that created it; it can
+        only be reused while that driver server (and its browser) keeps
+        running, so ``close()`` or exiting a process that launched its own
+        chromedriver ends it. ``ChromeBrowser(session=...)`` raises
+        ``RuntimeError`` for a dead session, or falls back to
+        ``debugger_address`` when one is configured.
+        """
+        return {
+            'executor_url': self.driver.command_executor.client_config.remote_server_addr,
+            'session_id': self.driver.session_id
+        }
+
     def _inject_anti_detection_scripts(self):
         """Inject JavaScript to mask Selenium/WebDriver presence."""
         anti_detection_js = """
@@ -177,7 +373,7 @@ class ChromeBrowser(BaseBrowser):
             'download.prompt_for_download': False,
             'download.default_directory': "/dev/null",
             'profile.managed_default_content_settings.javascript': 1,
-            'profile.managed_default_content_settings.images': 1
+            'profile.managed_default_content_settings.images': 2 if self.launch_profile.get('block_images') else 1
         }
         
         # Add experimental options
@@ -204,16 +400,12 @@ class ChromeBrowser(BaseBrowser):
         options.add_argument('--disable-popup-blocking')
     
     def random_time_delay(self, min_delay: float = 0.5, max_delay: float = 3.0):
-        delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
-
-    def random_implicitly_delay(self, min_delay: float = 0.5, max_delay: float = 3.0):
-        delay = random.uniform(min_delay, max_delay)
-        self.driver.implicitly_wait(delay)
+        self.pause('default', min_delay, max_delay)
 
     def random_delay(self, time_delay: float, implicitly_delay: float):
-        self.random_time_delay(time_delay)
-        self.random_implicitly_delay(implicitly_delay)
+        # Kept for callers of the old API: sleeps between time_delay and 3s as
+        # before and leaves the driver-wide implicit wait alone
+        self.pause('default', time_delay, 3.0)
 
     def move_mouse_randomly(self):
         """Simulate random mouse movements."""
@@ -239,13 +431,21 @@ class ChromeBrowser(BaseBrowser):
     
     def wait_for_element(self, by: By, value: str, timeout: int = 10):
         """Wait for element with random delay to simulate human behavior."""
-        self.random_implicitly_delay(1.0, 3.0)
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((by, value))
-        )
+        self.pause('wait_for_element', 1.0, 3.0)
+        return self._wait(EC.presence_of_element_located((by, value)), timeout)
     
+    def detach(self):
+        """Stop driving the browser but leave it (and, for reused sessions, the session) running."""
+        service = getattr(self.driver, 'service', None)
+        if service is not None:
+            # Only stops our chromedriver, Chrome was launched by someone else
+            service.stop()
+
     def close(self):
-        """Clean up and close the browser."""
+        """Clean up and close the browser, or only detach from an attached one."""
+        if self.attached:
+            self.detach()
+            return
         # try:
         #     # Clear cookies and cache before closing
         #     self.driver.execute_script("window.localStorage.clear();")
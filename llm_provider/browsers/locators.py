@@ -0,0 +1,132 @@
+from typing import Dict, Any, List, Sequence, Tuple, Union, Hashable
+from selenium.webdriver.common.by import By
+
+# A config locator: one selector or an ordered list of fallbacks. Selectors may
+# carry a strategy prefix, unprefixed ones are XPath:
+#
+#   input_xpath: "css:div#prompt-textarea"
+#   send_button_xpath: ["id:send", "//button[@data-testid='send-button']"]
+Locator = Union[str, Sequence[str]]
+
+STRATEGY_PREFIXES = ('xpath', 'css', 'id', 'name', 'tag')
+
+BY_STRATEGY = {
+    'xpath': By.XPATH,
+    'css': By.CSS_SELECTOR,
+}
+
+def _css_attribute(name: str, value: str) -> str:
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'[{name}="{escaped}"]'
+
+def parse_selector(selector: str, default: str = 'xpath') -> Tuple[str, str]:
+    """Split ``selector`` into ``(strategy, value)`` with strategy 'xpath' or 'css'.
+
+    ``id:``, ``name:`` and ``tag:`` selectors are expressed as CSS so that
+    in-page scripts only need to handle two strategies.
+    """
+    strategy, value = default, selector
+    prefix, separator, rest = selector.partition(':')
+    if separator and prefix in STRATEGY_PREFIXES:
+        strategy, value = prefix, rest.strip()
+
+    if strategy == 'id':
+        return 'css', _css_attribute('id', value)
+    if strategy == 'name':
+        return 'css', _css_attribute('name', value)
+    if strategy == 'tag':
+        return 'css', value
+    if strategy not in BY_STRATEGY:
+        raise ValueError(f'Unknown locator strategy: {strategy}')
+    return strategy, value
+
+def parse_locator(locator: Locator, default: str = 'xpath') -> List[Tuple[str, str]]:
+    """Return the ordered ``(strategy, value)`` fallbacks of ``locator``."""
+    selectors = [locator] if isinstance(locator, str) else list(locator)
+    if not selectors:
+        raise ValueError('Empty locator')
+    return [parse_selector(selector, default) for selector in selectors]
+
+def by_pairs(locator: Locator, default: str = 'xpath') -> List[Tuple[str, str]]:
+    """Return ``locator`` as Selenium ``(By, value)`` pairs."""
+    return [(BY_STRATEGY[strategy], value) for strategy, value in parse_locator(locator, default)]
+
+def script_locator(locator: Locator, default: str = 'xpath') -> List[List[str]]:
+    """Return ``locator`` in the ``[[strategy, value], ...]`` form in-page scripts take."""
+    return [[strategy, value] for strategy, value in parse_locator(locator, default)]
+
+def locator_key(locator: Locator) -> Hashable:
+    return locator if isinstance(locator, str) else tuple(locator)
+
+def describe(locator: Locator) -> str:
+    return locator if isinstance(locator, str) else ' | '.join(locator)
+
+def configured_locators(config: Dict[str, Any]) -> Dict[str, Locator]:
+    """Collect the ``*_xpath`` entries of a config section, ChatGPT's model entries as ``models.<name>``.
+
+    Templates (entries containing ``{``) are skipped, they are only complete
+    once formatted at runtime.
+    """
+    locators = {}
+    for key, value in config.items():
+        if key == 'models' and isinstance(value, dict):
+            for model, locator in value.items():
+                if isinstance(locator, (str, list)):
+                    locators[f'models.{model}'] = locator
+        elif key.endswith('_xpath') and value:
+            locators[key] = value
+    return {name: locator for name, locator in locators.items() if '{' not in describe(locator)}
+
+def apply_fallbacks(config: Dict[str, Any], report: Dict[str, Dict[str, Any]]) -> Dict[str, Locator]:
+    """Move the first matching fallback of each locator in ``report`` to the front of its config entry.
+
+    Returns the changed entries by name.
+    """
+    changed = {}
+    for name, entry in report.items():
+        match = entry.get('match')
+        if not match:
+            continue
+        if name.startswith('models.'):
+            section, key = config['models'], name[len('models.'):]
+        else:
+            section, key = config, name
+        selectors = [section[key]] if isinstance(section[key], str) else list(section[key])
+        section[key] = [selectors[match]] + selectors[:match] + selectors[match + 1:]
+        changed[name] = section[key]
+    return changed
+
+class MissingSelectorsError(RuntimeError):
+    """Raised by a strict ``validate_selectors()`` when required locators match nothing."""
+
+    def __init__(self, missing: List[str], report: Dict[str, Dict[str, Any]]):
+        self.missing = missing
+        self.report = report
+        super().__init__(f'Required selectors not found: {", ".join(missing)}')
+
+VALIDATION_MODES = ('off', 'report', 'fallback', 'strict')
+
+def validate_selectors(browser, config: Dict[str, Any], mode: str = 'report', label: str = '') -> Dict[str, Dict[str, Any]]:
+    """Check every configured locator of ``config`` in one script call, see ``BaseLLMProvider.validate_selectors``."""
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f'Unknown selector check mode: {mode}')
+    if mode == 'off':
+        return {}
+
+    report = browser.check_locators(configured_locators(config))
+    for name, entry in report.items():
+        if 'error' in entry:
+            print(f'{label}: {name}: {entry["error"]}')
+
+    if mode in ('fallback', 'strict'):
+        for name, locator in apply_fallbacks(config, report).items():
+            print(f'{label}: {name} switched to fallback {locator[0]}')
+        # Entries that changed shape must be cached under their new key
+        browser.cache_locators(config[key] for key in config.get('cached_selectors', []))
+
+    missing = [key for key in config.get('required_selectors', []) if not report.get(key, {}).get('present')]
+    if missing:
+        if mode == 'strict':
+            raise MissingSelectorsError(missing, report)
+        print(f'{label}: required selectors not found: {", ".join(missing)}')
+    return report
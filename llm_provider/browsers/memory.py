@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Limit name -> (metric, bytes per unit of the limit)
+LIMITS = {
+    'max_js_heap_mb': ('js_heap_bytes', 2 ** 20),
+    'max_dom_nodes': ('dom_nodes', 1),
+    'max_rss_mb': ('rss_bytes', 2 ** 20),
+}
+
+class MemoryGovernor:
+    """Samples a browser's memory and decides when a long-running page must be refreshed.
+
+    A JS heap or DOM over its limit is solved by reloading the page; process
+    RSS over its limit also needs a fresh renderer, so the tab is recycled.
+    A limit that is still crossed right after the refresh (e.g. the DOM of a
+    long conversation) is left alone for that chat instead of refreshing it
+    again on every check. Samples are kept in ``samples`` (and passed to ``on_sample``) for
+    monitoring::
+
+        governor = MemoryGovernor(max_js_heap_mb=1024, max_dom_nodes=150000, interval=60)
+        action = governor.check(chatgpt)  # None, 'reload' or 'recycle'
+    """
+
+    def __init__(
+        self,
+        max_js_heap_mb: Optional[float] = None,
+        max_dom_nodes: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        interval: float = 60,
+        history: int = 100,
+        on_sample: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        self.limits = {
+            'max_js_heap_mb': max_js_heap_mb,
+            'max_dom_nodes': max_dom_nodes,
+            'max_rss_mb': max_rss_mb,
+        }
+        self.interval = interval
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.on_sample = on_sample
+        self.actions = {'reload': 0, 'recycle': 0}
+        self._last_check = None
+        # Chat id -> limits a refresh did not bring the page under
+        self._unresolved: Dict[Optional[str], set] = {}
+        self._rss_warned = False
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['MemoryGovernor']:
+        """Build a governor from a ``memory_limits`` config entry, None when it is missing."""
+        if not config:
+            return None
+        return cls(
+            max_js_heap_mb=config.get('max_js_heap_mb'),
+            max_dom_nodes=config.get('max_dom_nodes'),
+            max_rss_mb=config.get('max_rss_mb'),
+            interval=config.get('interval', 60),
+            history=config.get('history', 100)
+        )
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self.samples[-1] if self.samples else None
+
+    def sample(self, browser) -> Optional[Dict[str, Any]]:
+        """Measure ``browser`` once and record the result."""
+        metrics = browser.get_memory_metrics()
+        if metrics is None:
+            return None
+        metrics['time'] = time.time()
+        metrics['exceeded'] = self.exceeded(metrics)
+        self.samples.append(metrics)
+        if self.on_sample is not None:
+            self.on_sample(metrics)
+        return metrics
+
+    def exceeded(self, metrics: Dict[str, Any]) -> List[str]:
+        """Names of the limits ``metrics`` is over."""
+        over = []
+        for name, limit in self.limits.items():
+            metric, unit = LIMITS[name]
+            value = metrics.get(metric)
+            if limit is not None and value is not None and value > limit * unit:
+                over.append(name)
+        return over
+
+    def due(self) -> bool:
+        return self._last_check is None or time.monotonic() - self._last_check >= self.interval
+
+    def check(self, provider, force: bool = False) -> Optional[str]:
+        """Sample ``provider``'s browser when due and refresh its page if a limit is crossed.
+
+        Returns the action taken: None, 'reload' or 'recycle'.
+        """
+        if not force and not self.due():
+            return None
+        self._last_check = time.monotonic()
+
+        metrics = self.sample(provider.browser)
+        if not metrics:
+            return None
+        if self.limits['max_rss_mb'] is not None and metrics.get('rss_bytes') is None and not self._rss_warned:
+            print(f'{provider.provider_name}: browser RSS unavailable (is psutil installed?), skipping max_rss_mb')
+            self._rss_warned = True
+
+        chat_id = provider.current_chat_id()
+        # A limit the page fell back under may be refreshed for again
+        unresolved = self._unresolved.pop(chat_id, set()) & set(metrics['exceeded'])
+        if unresolved:
+            self._unresolved[chat_id] = unresolved
+        exceeded = [name for name in metrics['exceeded'] if name not in unresolved]
+        if not exceeded:
+            return None
+
+        action = 'recycle' if 'max_rss_mb' in exceeded else 'reload'
+        print(f'{provider.provider_name}: memory over {", ".join(exceeded)}, {action} page')
+        if not provider.refresh_page(recycle=action == 'recycle'):
+            return None
+        self.actions[action] += 1
+
+        after = self.sample(provider.browser)
+        still_over = set(exceeded) & set(after['exceeded'] if after else [])
+        if still_over:
+            print(f'{provider.provider_name}: still over {", ".join(sorted(still_over))} after the {action}, not refreshing this chat for it again')
+            self._unresolved[provider.current_chat_id()] = unresolved | still_over
+        return action
@@ -0,0 +1,469 @@
+"""JavaScript snippets executed inside the page by BaseBrowser helpers."""
+
+# Locators arrive as ordered [[strategy, value], ...] fallbacks (see
+# locators.script_locator) with strategy 'xpath' or 'css'. The first strategy
+# that matches anything wins. Prepended to the scripts that resolve locators.
+LOCATOR_HELPERS_JS = """
+    function queryAll(locator, root) {
+        root = root || document;
+        for (var i = 0; i < locator.length; i++) {
+            var nodes = [];
+            if (locator[i][0] === 'css') {
+                nodes = Array.prototype.slice.call(root.querySelectorAll(locator[i][1]));
+            } else {
+                var result = document.evaluate(locator[i][1], root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var j = 0; j < result.snapshotLength; j++) {
+                    nodes.push(result.snapshotItem(j));
+                }
+            }
+            if (nodes.length) {
+                return nodes;
+            }
+        }
+        return [];
+    }
+
+    function queryFirst(locator, root) {
+        root = root || document;
+        for (var i = 0; i < locator.length; i++) {
+            var node = null;
+            if (locator[i][0] === 'css') {
+                node = root.querySelector(locator[i][1]);
+            } else {
+                node = document.evaluate(locator[i][1], root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            }
+            if (node) {
+                return node;
+            }
+        }
+        return null;
+    }
+"""
+
+# Installs (once per page) a MutationObserver that timestamps DOM activity and
+# exposes a cheap probe of the latest assistant message.
+# arguments: message_locator, streaming_locator, id_attribute
+RESPONSE_OBSERVER_JS = LOCATOR_HELPERS_JS + """
+    var messageLocator = arguments[0];
+    var streamingLocator = arguments[1];
+    var idAttribute = arguments[2];
+    var signature = JSON.stringify([messageLocator, streamingLocator, idAttribute]);
+
+    var existing = window.__llmObserver;
+    if (existing && existing.signature === signature && existing.root === document.body) {
+        return true;
+    }
+    if (existing && existing.observer) {
+        existing.observer.disconnect();
+    }
+
+    function first(locator) {
+        return locator.length ? queryFirst(locator) : null;
+    }
+
+    function hash(text) {
+        // 32-bit FNV-1a, enough to tell two snapshots of one message apart
+        var h = 0x811c9dc5;
+        for (var i = 0; i < text.length; i++) {
+            h ^= text.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        return (h >>> 0).toString(16);
+    }
+
+    var state = {
+        signature: signature,
+        streamingLocator: streamingLocator,
+        root: document.body,
+        lastMutation: Date.now(),
+        listeners: [],
+        first: first,
+        queryAll: queryAll
+    };
+
+    state.latest = function() {
+        var nodes = queryAll(messageLocator);
+        var node = nodes.length ? nodes[nodes.length - 1] : null;
+        var id = null;
+        if (node) {
+            id = (idAttribute && node.getAttribute(idAttribute)) || String(nodes.length);
+        }
+        return {node: node, id: id, count: nodes.length};
+    };
+
+    state.probe = function() {
+        var latest = state.latest();
+        var text = latest.node ? (latest.node.innerText || latest.node.textContent || '') : '';
+        return {
+            id: latest.id,
+            count: latest.count,
+            streaming: !!first(streamingLocator),
+            length: text.length,
+            hash: hash(text),
+            idle_ms: Date.now() - state.lastMutation
+        };
+    };
+
+    state.observer = new MutationObserver(function() {
+        state.lastMutation = Date.now();
+        state.listeners.slice().forEach(function(listener) { listener(); });
+    });
+    state.observer.observe(document.body, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true
+    });
+
+    window.__llmObserver = state;
+    return true;
+"""
+
+# Returns the observer probe, or null when the observer is not installed.
+# `ready` tells whether the completion locator (if any) is present.
+# arguments: completion_locator
+RESPONSE_STATE_JS = """
+    var observer = window.__llmObserver;
+    if (!observer) {
+        return null;
+    }
+    var completion = arguments[0] || [];
+    var state = observer.probe();
+    state.ready = !completion.length || !!observer.first(completion);
+    return state;
+"""
+
+# Async script: resolves once a message other than `previous_id` exists, nothing
+# is streaming, the completion marker is present and the DOM has been quiet for
+# `settle_ms`. Resolves with complete=false when `timeout_ms` elapses first.
+# arguments: previous_id, completion_locator, settle_ms, timeout_ms, callback
+WAIT_RESPONSE_STATE_JS = """
+    var previousId = arguments[0];
+    var completionLocator = arguments[1];
+    var settleMs = arguments[2];
+    var timeoutMs = arguments[3];
+    var done = arguments[arguments.length - 1];
+
+    var observer = window.__llmObserver;
+    if (!observer) {
+        done(null);
+        return;
+    }
+
+    var finished = false;
+    var settleTimer = null;
+    var heartbeat = null;
+    var deadline = null;
+
+    function finish(state, complete) {
+        if (finished) {
+            return;
+        }
+        finished = true;
+        clearTimeout(settleTimer);
+        clearTimeout(deadline);
+        clearInterval(heartbeat);
+        var index = observer.listeners.indexOf(onMutation);
+        if (index >= 0) {
+            observer.listeners.splice(index, 1);
+        }
+        state.complete = complete;
+        done(state);
+    }
+
+    function check() {
+        var state = observer.probe();
+        var ready = !completionLocator.length || !!observer.first(completionLocator);
+        if (state.id !== null && state.id !== previousId && !state.streaming && ready && state.idle_ms >= settleMs) {
+            finish(state, true);
+        }
+    }
+
+    function onMutation() {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(check, settleMs);
+    }
+
+    observer.listeners.push(onMutation);
+    heartbeat = setInterval(check, Math.max(settleMs, 1000));
+    deadline = setTimeout(function() { finish(observer.probe(), false); }, timeoutMs);
+    check();
+"""
+
+# Returns the text appended to the latest message since the previous call. The
+# text already returned lives in the page so each call only transfers the new
+# text. When the page re-rendered earlier text (e.g. into markdown, code blocks
+# or lists) the emitted prefix no longer matches; `reset` is then set and
+# `text` carries the full current text.
+# arguments: previous_id, completion_locator, settle_ms
+READ_RESPONSE_DELTA_JS = """
+    var previousId = arguments[0];
+    var completionLocator = arguments[1];
+    var settleMs = arguments[2];
+
+    var observer = window.__llmObserver;
+    if (!observer) {
+        return null;
+    }
+
+    var latest = observer.latest();
+    if (latest.id === null || latest.id === previousId) {
+        return {id: latest.id, delta: '', reset: false, started: false, streaming: false, complete: false};
+    }
+
+    var text = latest.node.innerText || latest.node.textContent || '';
+    var buffer = observer.stream;
+    if (!buffer || buffer.id !== latest.id) {
+        buffer = observer.stream = {id: latest.id, emitted: ''};
+    }
+    var reset = text.slice(0, buffer.emitted.length) !== buffer.emitted;
+    var delta = reset ? '' : text.slice(buffer.emitted.length);
+    buffer.emitted = text;
+
+    var streaming = !!observer.first(observer.streamingLocator);
+    var ready = !completionLocator.length || !!observer.first(completionLocator);
+    var idle = Date.now() - observer.lastMutation;
+    return {
+        id: latest.id,
+        delta: delta,
+        reset: reset,
+        text: reset ? text : null,
+        started: true,
+        streaming: streaming,
+        complete: !streaming && ready && idle >= settleMs
+    };
+"""
+
+# Extracts {href, title, id, text} for every element matched by a locator in a
+# single round trip. `root` scopes the lookup (document when null).
+# arguments: locator, title_locator, id_attribute, include_text, root
+SNAPSHOT_ELEMENTS_JS = LOCATOR_HELPERS_JS + """
+    var locator = arguments[0];
+    var titleLocator = arguments[1];
+    var idAttribute = arguments[2];
+    var includeText = arguments[3];
+    var root = arguments[4] || document;
+
+    var nodes = queryAll(locator, root);
+
+    return nodes.map(function(node) {
+        var link = (node.matches && node.matches('a[href]')) ? node : node.querySelector('a[href]');
+        var text = (includeText || !titleLocator.length) ? (node.innerText || '') : null;
+        var title = text;
+        if (titleLocator.length) {
+            var titleNode = queryFirst(titleLocator, node);
+            title = titleNode ? (titleNode.innerText || '') : null;
+        }
+        return {
+            href: link ? link.href : null,
+            title: title,
+            id: (idAttribute ? node.getAttribute(idAttribute) : node.id) || null,
+            text: includeText ? text : null
+        };
+    });
+"""
+
+# Replaces the content of a textarea/input or contenteditable composer with
+# `text` in one operation and returns what the element now contains. Editors
+# (ProseMirror, Lexical) get a synthetic paste so they build their own
+# paragraphs; plain contenteditables fall back to insertText.
+# arguments: element, text
+INSERT_TEXT_JS = """
+    var element = arguments[0];
+    var text = arguments[1];
+    element.focus();
+
+    if (element.tagName === 'TEXTAREA' || element.tagName === 'INPUT') {
+        var proto = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        // Use the native setter so React notices the change
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, text);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        return element.value;
+    }
+
+    var selection = window.getSelection();
+    var range = document.createRange();
+    range.selectNodeContents(element);
+    selection.removeAllRanges();
+    selection.addRange(range);
+
+    var data = new DataTransfer();
+    data.setData('text/plain', text);
+    var paste = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+    if (element.dispatchEvent(paste)) {
+        // Nobody handled the paste
+        document.execCommand('insertText', false, text);
+    }
+    return element.innerText;
+"""
+
+# Reports whether the page is loaded, every locator matches and no resource
+# has finished loading for `idle_ms`. The latest resource end time is kept on
+# the window so the resource timing buffer can be cleared before it fills up.
+# `missing` holds the indexes of the locators that did not match.
+# arguments: locators, idle_ms
+READINESS_JS = LOCATOR_HELPERS_JS + """
+    var locators = arguments[0];
+    var idleMs = arguments[1];
+
+    var missing = [];
+    locators.forEach(function(locator, index) {
+        if (!queryFirst(locator)) {
+            missing.push(index);
+        }
+    });
+
+    var entries = performance.getEntriesByType('resource');
+    var lastEnd = window.__llmLastResourceEnd || 0;
+    for (var i = 0; i < entries.length; i++) {
+        lastEnd = Math.max(lastEnd, entries[i].responseEnd);
+    }
+    window.__llmLastResourceEnd = lastEnd;
+    if (entries.length > 200) {
+        performance.clearResourceTimings();
+    }
+
+    var idle = performance.now() - lastEnd;
+    var loaded = document.readyState === 'complete';
+    return {
+        ready: loaded && missing.length === 0 && idle >= idleMs,
+        loaded: loaded,
+        missing: missing,
+        idle_ms: idle
+    };
+"""
+
+# Cheap validation of a cached element: returns null when it is detached (or,
+# for 'visible' and 'clickable', hidden or disabled), otherwise a signature of
+# its identifying attributes. A changed signature means the node was reused
+# for something else, e.g. a send button turned into a stop button.
+# arguments: element, wait_type
+LOCATOR_SIGNATURE_JS = """
+    var el = arguments[0];
+    var waitType = arguments[1];
+    if (!el || !el.isConnected) {
+        return null;
+    }
+    if (waitType === 'visible' || waitType === 'clickable') {
+        if (!el.getClientRects().length) {
+            return null;
+        }
+    }
+    if (waitType === 'clickable') {
+        if (el.disabled || el.getAttribute('aria-disabled') === 'true') {
+            return null;
+        }
+    }
+    var keys = ['id', 'data-testid', 'role', 'name', 'type', 'aria-label', 'contenteditable'];
+    return el.tagName + '|' + keys.map(function(key) {
+        return el.getAttribute(key) || '';
+    }).join('|');
+"""
+
+# Times every locator `repeat` times in the page. Returns per name the median
+# and best time in ms of each fallback and how many nodes it matched.
+# arguments: {name: locator}, repeat
+TIME_LOCATORS_JS = LOCATOR_HELPERS_JS + """
+    var locators = arguments[0];
+    var repeat = arguments[1];
+    var report = {};
+
+    Object.keys(locators).forEach(function(name) {
+        report[name] = locators[name].map(function(strategy) {
+            var samples = [];
+            var count = 0;
+            for (var i = 0; i < repeat; i++) {
+                var start = performance.now();
+                count = queryAll([strategy]).length;
+                samples.push(performance.now() - start);
+            }
+            samples.sort(function(a, b) { return a - b; });
+            return {
+                strategy: strategy[0],
+                value: strategy[1],
+                count: count,
+                median_ms: samples[Math.floor(samples.length / 2)],
+                best_ms: samples[0]
+            };
+        });
+    });
+    return report;
+"""
+
+# Counts the matches of every fallback of every locator in one pass. Invalid
+# selectors count as -1 instead of failing the whole probe.
+# arguments: {name: locator}
+PROBE_LOCATORS_JS = LOCATOR_HELPERS_JS + """
+    var locators = arguments[0];
+    var report = {};
+    Object.keys(locators).forEach(function(name) {
+        report[name] = locators[name].map(function(strategy) {
+            try {
+                return queryAll([strategy]).length;
+            } catch (err) {
+                return -1;
+            }
+        });
+    });
+    return report;
+"""
+
+# Returns the name of the first locator whose first element contains a node
+# matching `marker` (e.g. the check mark of the active menu item), or null.
+# arguments: {name: locator}, marker (CSS selector)
+FIND_MARKED_JS = LOCATOR_HELPERS_JS + """
+    var locators = arguments[0];
+    var marker = arguments[1];
+    var names = Object.keys(locators);
+    for (var i = 0; i < names.length; i++) {
+        var node = queryFirst(locators[names[i]]);
+        if (node && node.querySelector(marker)) {
+            return names[i];
+        }
+    }
+    return null;
+"""
+
+# Page memory gauges: JS heap in use (Chromium only, null elsewhere) and DOM
+# element count.
+MEMORY_METRICS_JS = """
+    var memory = window.performance && window.performance.memory;
+    return {
+        js_heap_bytes: memory ? memory.usedJSHeapSize : null,
+        dom_nodes: document.getElementsByTagName('*').length
+    };
+"""
+
+# Returns the text of the messages from the one keyed `cursor` (inclusive, so
+# a message that was still growing is read again) to the end, or of all
+# messages when `cursor` is null or no longer on the page. Keys are the
+# `id_attribute` value or, without one, the 1-based position.
+# arguments: locator, id_attribute, cursor
+READ_MESSAGES_JS = LOCATOR_HELPERS_JS + """
+    var locator = arguments[0];
+    var idAttribute = arguments[1];
+    var cursor = arguments[2];
+
+    var nodes = queryAll(locator);
+    function key(node, index) {
+        return (idAttribute && node.getAttribute(idAttribute)) || String(index + 1);
+    }
+
+    var start = -1;
+    if (cursor !== null) {
+        // Search backwards, the cursor is normally one of the last messages
+        for (var i = nodes.length - 1; i >= 0; i--) {
+            if (key(nodes[i], i) === cursor) {
+                start = i;
+                break;
+            }
+        }
+    }
+
+    var messages = [];
+    for (var j = Math.max(start, 0); j < nodes.length; j++) {
+        messages.push({key: key(nodes[j], j), text: nodes[j].innerText || ''});
+    }
+    return {messages: messages, count: nodes.length, cursor_found: start >= 0};
+"""
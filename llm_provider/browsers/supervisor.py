@@ -0,0 +1,167 @@
+"""Keep a warm Chrome running between jobs so workers attach instead of launching.
+
+    python -m llm_provider.browsers.supervisor [--port 9222] [--interval 5]
+
+Workers then attach with ``ChromeBrowser(debugger_address='127.0.0.1:9222')``
+or by setting ``chrome.debugger_address`` in the config.
+"""
+import json
+import time
+import argparse
+import subprocess
+import urllib.request
+from typing import Optional, List, Dict, Any
+from ..config import CONFIG
+from ..utils.browser_utils import get_profile_paths
+from .chrome import ChromeBrowser, desktop_chrome_user_agents, launch_arguments
+
+class ChromeSupervisor:
+    """Launches Chrome with a remote-debugging port and restarts it when it dies.
+
+    ``start()`` reuses a Chrome that is already listening on the port, so
+    several supervisors (or a restarted one) never launch a second browser on
+    the same profile.
+    """
+
+    def __init__(
+        self,
+        port: Optional[int] = None,
+        host: str = '127.0.0.1',
+        binary_path: Optional[str] = None,
+        proxy: Optional[str] = None,
+        extra_arguments: Optional[List[str]] = None,
+        launch_profile: Optional[str] = None
+    ):
+        self.chrome_config = CONFIG['chrome']
+        # Request blocking is applied by each attaching ChromeBrowser, only the flags are set here
+        self.launch_profile = self.chrome_config.get('launch_profiles', {}).get(
+            launch_profile or self.chrome_config.get('launch_profile', 'default')
+        ) or {}
+        self.host = host
+        self.port = port or self.chrome_config.get('remote_debugging_port', 9222)
+        self.binary_path = binary_path or self.chrome_config.get('binary_path') or None
+        self.proxy = proxy
+        self.extra_arguments = list(extra_arguments or [])
+        self.process = None
+        self.restarts = 0
+
+    @property
+    def debugger_address(self) -> str:
+        return f'{self.host}:{self.port}'
+
+    def version(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        """The ``/json/version`` answer of the debugging endpoint, None when nothing is listening."""
+        try:
+            with urllib.request.urlopen(f'http://{self.debugger_address}/json/version', timeout=timeout) as response:
+                return json.load(response)
+        except (OSError, ValueError):
+            return None
+
+    def is_alive(self) -> bool:
+        return self.version() is not None
+
+    def _command(self) -> List[str]:
+        binary = self.binary_path
+        if binary is None:
+            from undetected_chromedriver import find_chrome_executable
+            binary = find_chrome_executable()
+        if not binary:
+            raise FileNotFoundError('Chrome executable not found, set chrome.binary_path')
+
+        profile = (None, None)
+        if self.chrome_config.get('load_profile', True):
+            profile = get_profile_paths('chrome')
+        return [
+            binary,
+            f'--remote-debugging-port={self.port}',
+            f'--remote-debugging-address={self.host}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            *launch_arguments(desktop_chrome_user_agents().random, self.proxy, *profile, self.launch_profile),
+            *(['--headless=new'] if self.launch_profile.get('headless') else []),
+            *self.extra_arguments
+        ]
+
+    def start(self, timeout: float = 30) -> bool:
+        """Make sure a Chrome is listening on the port, launching one if needed."""
+        if self.is_alive():
+            return True
+
+        if self.process is not None and self.process.poll() is None:
+            # Running but not answering, start over
+            self.stop()
+        try:
+            self.process = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f'Failed to launch Chrome: {e}')
+            return False
+
+        end_time = time.monotonic() + timeout
+        while time.monotonic() < end_time:
+            if self.is_alive():
+                print(f'Chrome listening at {self.debugger_address} (pid {self.process.pid})')
+                return True
+            if self.process.poll() is not None:
+                print(f'Chrome exited with code {self.process.returncode} during startup')
+                return False
+            time.sleep(0.2)
+        print(f'Chrome did not open {self.debugger_address} within {timeout}s')
+        return False
+
+    def ensure_running(self) -> bool:
+        """Restart Chrome if it is no longer answering."""
+        if self.is_alive():
+            return True
+        print(f'Chrome at {self.debugger_address} is not answering, restarting')
+        self.restarts += 1
+        return self.start()
+
+    def attach(self, **kwargs) -> ChromeBrowser:
+        """Return a ``ChromeBrowser`` attached to the supervised Chrome."""
+        if not self.ensure_running():
+            raise RuntimeError(f'No Chrome available at {self.debugger_address}')
+        return ChromeBrowser(debugger_address=self.debugger_address, **kwargs)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Shut down the Chrome this supervisor launched."""
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def run_forever(self, interval: float = 5) -> None:
+        """Keep Chrome alive until interrupted, then shut it down."""
+        if not self.start():
+            return
+        try:
+            while True:
+                time.sleep(interval)
+                self.ensure_running()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=None, help='remote-debugging port, defaults to chrome.remote_debugging_port')
+    parser.add_argument('--host', default='127.0.0.1', help='address the debugging endpoint listens on')
+    parser.add_argument('--proxy', default=None, help='proxy server for the browser')
+    parser.add_argument('--interval', type=float, default=5, help='seconds between health checks')
+    parser.add_argument('--launch-profile', default=None, help='entry of chrome.launch_profiles, e.g. lean')
+    args = parser.parse_args()
+
+    ChromeSupervisor(args.port, args.host, proxy=args.proxy, launch_profile=args.launch_profile).run_forever(args.interval)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import time
+import random
+from typing import Callable, Iterator, Optional, Tuple, Type, TypeVar
+from selenium.common.exceptions import (
+    TimeoutException,
+    WebDriverException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from ..utils.deadline import DeadlineExceeded, current_deadline
+
+T = TypeVar('T')
+
+# Exceptions that only mean "not yet" while polling a condition
+POLL_IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+def poll_intervals(
+    initial_interval: float = 0.05,
+    max_interval: float = 0.5,
+    backoff: float = 1.5
+) -> Iterator[float]:
+    """Yield polling intervals that start small and grow geometrically up to ``max_interval``."""
+    interval = initial_interval
+    while True:
+        yield interval
+        interval = min(interval * backoff, max_interval)
+
+def wait_until(
+    condition: Callable[[], T],
+    timeout: float,
+    initial_interval: float = 0.05,
+    max_interval: float = 0.5,
+    backoff: float = 1.5,
+    ignored_exceptions: Tuple[Type[BaseException], ...] = POLL_IGNORED_EXCEPTIONS,
+    message: str = ''
+) -> T:
+    """
+    Poll ``condition`` until it returns a truthy value and return that value.
+
+    Polling is adaptive: fast right after the call and backing off towards
+    ``max_interval``, so quick UI reactions are seen within tens of
+    milliseconds. Never sleeps past ``timeout``; raises ``TimeoutException``
+    when it expires. ``timeout`` is cut to the active deadline, which raises
+    ``DeadlineExceeded`` instead once it is the limit that ran out.
+    """
+    deadline = current_deadline()
+    limited_by_deadline = False
+    if deadline is not None:
+        deadline.check(message)
+        limited_by_deadline = deadline.remaining() < timeout
+        timeout = deadline.clamp(timeout)
+
+    end_time = time.monotonic() + timeout
+    intervals = poll_intervals(initial_interval, max_interval, backoff)
+    last_error = None
+    while True:
+        try:
+            value = condition()
+            if value:
+                return value
+        except ignored_exceptions as e:
+            last_error = e
+
+        if deadline is not None and deadline.cancelled:
+            raise deadline.exceeded(message)
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            if limited_by_deadline:
+                raise deadline.exceeded(message or str(last_error or ''))
+            detail = f': {last_error}' if last_error and not message else ''
+            raise TimeoutException(f'{message or "Condition not met"} after {timeout}s{detail}')
+        time.sleep(min(next(intervals), remaining))
+
+def retry(
+    action: Callable[[int], T],
+    attempts: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    jitter: float = 0.5,
+    retry_on: Tuple[Type[BaseException], ...] = (WebDriverException,),
+    deadline: Optional[float] = None
+) -> T:
+    """
+    Run ``action(attempt)`` until it succeeds, retrying on ``retry_on``.
+
+    Delays grow exponentially from ``base_delay`` and are randomized by up to
+    ``jitter`` of their length. ``deadline`` (a ``time.monotonic()`` value,
+    by default the end of the active ``Deadline``) stops retrying early. The
+    last exception is re-raised, ``DeadlineExceeded`` is never retried.
+    """
+    if deadline is None and current_deadline() is not None:
+        deadline = current_deadline().expires_at
+
+    for attempt in range(attempts):
+        try:
+            return action(attempt)
+        except DeadlineExceeded:
+            raise
+        except retry_on:
+            delay = min(base_delay * (2 ** attempt), max_delay)
+            delay *= 1 + random.uniform(-jitter, jitter)
+            out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+            if attempt == attempts - 1 or out_of_time:
+                raise
+            time.sleep(max(delay, 0))
+
+def first_of(*conditions: Callable):
+    """Combine expected conditions: the first truthy result of any of them, checked in order."""
+    def condition(driver):
+        for candidate in conditions:
+            try:
+                value = candidate(driver)
+            except POLL_IGNORED_EXCEPTIONS:
+                continue
+            if value:
+                return value
+        return False
+    return condition
@@ -1,12 +1,17 @@
-import yaml
 import os
+from collections import UserDict
 from typing import Dict, Any
 from importlib import resources
 
+def _yaml_load(stream) -> Any:
+    # Imported on first use, prefer the libyaml loader which is ~20x faster
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
 def _load_default_config() -> Dict[str, Any]:
     try:
         with resources.open_text("llm_provider", "default_config.yaml") as f:
-            return yaml.safe_load(f)
+            return _yaml_load(f)
     except Exception as e:
         print(f"Error loading default config: {str(e)}")
         return {}
@@ -17,7 +22,7 @@ def load_user_config(config_path: str) -> Dict[str, Any]:
         return {}
     try:
         with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return _yaml_load(f)
     except Exception as e:
         print(f"Error loading user config from {config_path}: {str(e)}")
         return {}
@@ -31,17 +36,38 @@ def _merge_configs(default: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, A
             merged[key] = value
     return merged
 
+class LazyConfig(UserDict):
+    """Mapping that parses the default config on first access rather than at import."""
+
+    def __init__(self):
+        self._data = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = _load_default_config()
+        return self._data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._data = value
+
+    def copy(self) -> Dict[str, Any]:
+        return self.data.copy()
+
+    __copy__ = copy
+
 # Initialize with default config
-CONFIG = _load_default_config()
+CONFIG = LazyConfig()
 
 def update_config(user_config_path: str):
-    global CONFIG
     user_config = load_user_config(user_config_path)
-    CONFIG = _merge_configs(CONFIG, user_config)
+    # Merged in place so modules that imported CONFIG see the update
+    CONFIG.data = _merge_configs(CONFIG.data, user_config)
 
 # Helper functions
 def get_browser_config(browser: str) -> Dict[str, Any]:
     return CONFIG.get(browser, {})
 
 def get_provider_config(provider: str) -> Dict[str, Any]:
-    return CONFIG.get(provider, {})
\ No newline at end of file
+    return CONFIG.get(provider, {})
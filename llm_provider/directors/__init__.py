@@ -1,2 +1,10 @@
-from .base import BaseDirectorProvider
-from .sora import SoraDirector
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    'BaseDirectorProvider': '.base',
+    'SoraDirector': '.sora',
+    'AsyncSoraDirector': '.asynchronous',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
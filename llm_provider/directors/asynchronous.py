@@ -0,0 +1,7 @@
+from ..browsers.actor import AsyncFacade
+from .sora import SoraDirector
+
+class AsyncSoraDirector(AsyncFacade):
+    """Asyncio facade of ``SoraDirector``, every call runs on the browser's actor thread."""
+
+    sync_class = SoraDirector
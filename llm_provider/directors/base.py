@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from ..browsers.base import BaseBrowser
+from ..browsers.locators import validate_selectors
+from ..utils.pacing import PacingPolicy
 
 class BaseDirectorProvider(ABC):
-    def __init__(self, browser: BaseBrowser, config: Dict[str, Any]):
+    def __init__(self, browser: BaseBrowser, config: Dict[str, Any], pacing: Optional[PacingPolicy] = None):
         self.browser = browser
         self.config = config
+        self.pacing = pacing or browser.pacing
 
     @abstractmethod
     def create_video(self, message: str) -> bool:
@@ -33,4 +36,21 @@ class BaseDirectorProvider(ABC):
 
     @abstractmethod
     def download_videos(self, path: str) -> bool:
-        pass
\ No newline at end of file
+        pass
+
+    def pause(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> float:
+        return self.pacing.delay(operation, min_delay, max_delay)
+
+    def validate_selectors(self, mode: str = 'report') -> Dict[str, Dict[str, Any]]:
+        """Check every configured locator in one script call, see ``BaseLLMProvider.validate_selectors``."""
+        return validate_selectors(self.browser, self.config, mode, label=type(self).__name__)
+
+    def navigate(self, url: str, ready: Optional[List[str]] = None) -> bool:
+        """Open ``url`` and wait for the config entries named in ``ready`` (default ``ready_selectors``)."""
+        keys = ready if ready is not None else self.config.get('ready_selectors', [])
+        return self.browser.navigate(
+            url,
+            [self.config[key] for key in keys],
+            min_wait=self.config.get('ready_min_wait', 0),
+            max_wait=self.config.get('ready_max_wait', 30)
+        )
\ No newline at end of file
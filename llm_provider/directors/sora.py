@@ -1,6 +1,6 @@
 import time
 from urllib.parse import urljoin
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,13 +8,15 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from .base import BaseDirectorProvider
 from ..browsers.base import BaseBrowser
+from ..utils.pacing import PacingPolicy
+from ..utils.deadline import DeadlineExceeded
 from ..utils.preprocessing import preprocess_prompt
 
 class SoraDirector(BaseDirectorProvider):
-    def __init__(self, browser: BaseBrowser, config: Dict[str, Any]):
-        super().__init__(browser, config)
-        self.browser.driver.get(self.config['url'])
-        self.browser.random_time_delay(15, 25)
+    def __init__(self, browser: BaseBrowser, config: Dict[str, Any], pacing: Optional[PacingPolicy] = None):
+        super().__init__(browser, config, pacing)
+        self.navigate(self.config['url'])
+        self.validate_selectors(self.config.get('selector_check', 'report'))
 
     def create_video(self, message: str) -> bool:
         try:
@@ -40,22 +42,28 @@ class SoraDirector(BaseDirectorProvider):
             print(f'Error creating video: {e}')
             return False
 
-    def create_video_safely(self, message: str, delay: int = 10, interval: int=5) -> bool:
-        # Send the prompt message to the input field
-        _ = self.browser.send_keys(self.config['input_xpath'], '', clear_first=True)
-
+    def create_video_safely(self, message: str, delay: int = 10, interval: int=5, bulk: bool = True) -> bool:
         messages = preprocess_prompt(message)
-        for message in messages:
-            send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=False)
-            self.browser.random_delay(interval, interval)
-            newline_status = self.browser.send_keys(self.config['input_xpath'], (Keys.SHIFT + Keys.ENTER), clear_first=False)
-            self.browser.random_delay(interval, interval)
 
-            if not (send_status and newline_status):
-                print('Failed to send message to input field')
-                return False
+        # Insert the whole prompt in one operation, only type it line by line as a fallback
+        inserted = bulk and self.browser.insert_text(self.config['input_xpath'], '\n'.join(messages))
+        if not inserted:
+            if bulk:
+                print('Bulk insertion could not be verified, typing line by line')
+            # Send the prompt message to the input field
+            _ = self.browser.send_keys(self.config['input_xpath'], '', clear_first=True)
+
+            for message in messages:
+                send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=False)
+                self.pause('type_line', interval, 3)
+                newline_status = self.browser.send_keys(self.config['input_xpath'], (Keys.SHIFT + Keys.ENTER), clear_first=False)
+                self.pause('type_line', interval, 3)
+
+                if not (send_status and newline_status):
+                    print('Failed to send message to input field')
+                    return False
         
-        self.browser.random_delay(delay, delay)
+        self.pause('before_send', delay, 3)
         # Click the general button
         click_status = self.browser.click_element(self.config['create_button_xpath'])
         if not click_status:
@@ -66,23 +74,26 @@ class SoraDirector(BaseDirectorProvider):
 
     def _click_general_button_by_text(self, possible_texts: list) -> bool:
         """Helper method to click general button using list of possible text values"""
-        try:
-            # Generate xpath with OR conditions for all possible text values
-            text_conditions = ' or '.join([f'contains(., "{text}")' for text in possible_texts])
-            # Combine with general button xpath
-            base_xpath = self.config['general_button_xpath']
-            full_xpath = f'{base_xpath}[.//span[{text_conditions}]]'
-            
-            # Click the button
-            click_status = self.browser.click_element(full_xpath)
-            self.browser.random_delay(3, 7)
+        def matching_button():
+            # Filtered here so general_button_xpath may use any locator strategy
+            for button in self.browser.locate_all(self.config['general_button_xpath']):
+                labels = [span.get_attribute('textContent') or '' for span in button.find_elements(By.XPATH, './/span')]
+                if any(text in label for label in labels for text in possible_texts):
+                    return button
+            return None
 
-            if not click_status:
+        try:
+            button = self.browser.wait_for(matching_button, timeout=10)
+            if button is None:
                 print(f'No button found matching any of texts: {possible_texts}')
                 return False
-                
+
+            button.click()
+            self.pause('menu', 3)
             return True
-            
+
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error clicking general button: {e}')
             return False
@@ -102,7 +113,7 @@ class SoraDirector(BaseDirectorProvider):
             for option in sorted_options:
                 if option_text in option.get_attribute('innerText'):
                     option.click()
-                    self.browser.random_delay(3, 7)
+                    self.pause('menu', 3)
                     return True
 
             print(f'Option not found: {option_text}')
@@ -172,12 +183,13 @@ class SoraDirector(BaseDirectorProvider):
         return self._select_option_from_popup(variation_str)
     
     def check_improvement(self) -> bool:
-        check_xpath = f'{self.config["latest_video_container_xpath"]}//{self.config["improve_div_xpath"].lstrip("./")}'
-        check_element = self.browser.find_element(check_xpath)
-        if check_element:
-            task_xpath = f'{self.config["latest_video_container_xpath"]}//{self.config["task_href_xpath"].lstrip("./")}'
-            task_links = self.browser.find_elements(task_xpath, timeout=30)
-                
+        container = self.browser.find_element(self.config['latest_video_container_xpath'])
+        if container and self.browser.locate(self.config['improve_div_xpath'], root=container):
+            task_links = self.browser.wait_for(
+                lambda: self.browser.locate_all(self.config['task_href_xpath'], root=container),
+                timeout=30
+            ) or []
+
             # Extract unique video IDs
             task_urls = set()
             for link in task_links:
@@ -187,14 +199,13 @@ class SoraDirector(BaseDirectorProvider):
                     task_urls.add(full_url)
 
             for url in task_urls:
-                self.browser.driver.get(url)
-                self.browser.random_delay(30, 15)
+                self.navigate(url, ready=['improve_confirm_xpath'])
                 self.browser.click_element(self.config['improve_confirm_xpath'])
-                self.browser.random_delay(5, 5)
+                self.pause('improve_step', 3, 5)
                 self.browser.click_element(self.config['keep_none_button_xpath'])
-                self.browser.random_delay(5, 5)
+                self.pause('improve_step', 3, 5)
                 self.browser.click_element(self.config['final_none_button_xpath'])
-                self.browser.random_delay(15, 20)
+                self.pause('improve_done', 3, 15)
             return True
         else:
             return False
@@ -210,60 +221,51 @@ class SoraDirector(BaseDirectorProvider):
             return False
         
         start_time = time.time()
-        combined_xpath = f'{self.config["latest_video_container_xpath"]}//{self.config["video_href_xpath"].lstrip("./")}'
-        while time.time() - start_time < max_wait_time:
-            # Get all video hrefs
-            video_links = self.browser.find_elements(combined_xpath, timeout=30)
-            if not video_links:
-                print('No video links found')
-                
-            # Extract unique video IDs
-            video_urls = set()
-            for link in video_links:
-                href = link.get_attribute('href')
-                full_url = urljoin(self.config['prefix'], href)
-                if href and '/g/' in href:
-                    video_urls.add(full_url)
 
-            if not video_urls:
-                # Check if we're still within wait time
-                if time.time() - start_time >= max_wait_time:
-                    print('Timeout waiting for videos to generate')
-                    return False
-                    
-                print('No videos ready yet, waiting 30 seconds...')
-                self.browser.random_time_delay(30, 30)
+        def generated_video_urls():
+            # The container is looked up again in case the page re-rendered it
+            container = self.browser.locate(self.config['latest_video_container_xpath'])
+            if container is None:
+                return None
+            # Links exist before generation finishes, only /g/ ones are videos
+            links = self.browser.locate_all(self.config['video_href_xpath'], root=container)
+            hrefs = [link.get_attribute('href') for link in links]
+            return {urljoin(self.config['prefix'], href) for href in hrefs if href and '/g/' in href}
+
+        while True:
+            remaining = max_wait_time - (time.time() - start_time)
+            video_urls = self.browser.wait_for(generated_video_urls, timeout=min(30, max(remaining, 0)), max_interval=5)
+            if video_urls:
+                break
 
-                if self.check_improvement():
-                    return False
+            if time.time() - start_time >= max_wait_time:
+                print('Timeout waiting for videos to generate')
+                return False
+
+            print('No videos ready yet, still waiting...')
+            if self.check_improvement():
+                return False
 
-                continue
-            else:
-                # print(f'Found {len(video_urls)} unique videos to download')
-                break
-        
         # Process each video URL
         for url in video_urls:
             # Navigate to video page
-            self.browser.driver.get(url)
-            self.browser.random_delay(30, 15)
+            self.navigate(url, ready=['first_download_xpath'])
             
             # Click download button
             download_button = self.browser.find_element(self.config['first_download_xpath'], 10, wait_type='clickable')
             download_button.click()
-            self.browser.random_delay(10, 15)
+            self.pause('download_menu', 3, 10)
             
             # Find and click Video option in dropdown
             video_option = self.browser.find_element(self.config['download_option_xpath'], 10, wait_type='clickable')
             video_option.click()
-            self.browser.random_delay(15, 15)
+            self.pause('download_step', 3, 15)
             
             # Click final download button
             final_download = self.browser.find_element(self.config['second_download_xpath'], 10, wait_type='clickable')
             final_download.click()
-            self.browser.random_delay(15, 15)
+            self.pause('download_step', 3, 15)
 
-        self.browser.driver.get(original_url)
-        self.browser.random_delay(15, 30)
+        self.navigate(original_url)
 
         return True
\ No newline at end of file
@@ -1,3 +1,18 @@
-from .chatgpt import ChatGPTProvider
-from .claude import ClaudeProvider
-from .base import BaseLLMProvider
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    'ChatGPTProvider': '.chatgpt',
+    'ClaudeProvider': '.claude',
+    'BaseLLMProvider': '.base',
+    'Response': '.response',
+    'ArtifactHandle': '.response',
+    'StreamReset': '.response',
+    'AsyncChatGPTProvider': '.asynchronous',
+    'AsyncClaudeProvider': '.asynchronous',
+    'TabScheduler': '.scheduler',
+    'ConversationTab': '.scheduler',
+    'BrowserPool': '.pool',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,25 @@
+from typing import AsyncIterator
+from ..browsers.actor import AsyncFacade
+from .chatgpt import ChatGPTProvider
+from .claude import ClaudeProvider
+
+class AsyncProviderMixin:
+    def stream_response(self, **kwargs) -> AsyncIterator[str]:
+        """Async iterator over the deltas of ``BaseLLMProvider.stream_response``."""
+        return self.iterate('stream_response', **kwargs)
+
+class AsyncChatGPTProvider(AsyncProviderMixin, AsyncFacade):
+    """Asyncio facade of ``ChatGPTProvider``, every call runs on the browser's actor thread.
+
+    Example::
+
+        chatgpt = await AsyncChatGPTProvider.create(browser, CONFIG['chatgpt'])
+        response = await chatgpt.ask('Hello', deadline=120)
+    """
+
+    sync_class = ChatGPTProvider
+
+class AsyncClaudeProvider(AsyncProviderMixin, AsyncFacade):
+    """Asyncio facade of ``ClaudeProvider``, every call runs on the browser's actor thread."""
+
+    sync_class = ClaudeProvider
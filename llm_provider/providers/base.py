@@ -1,15 +1,47 @@
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Iterator
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from ..browsers.base import BaseBrowser
+from ..browsers.locators import validate_selectors
+from ..browsers.memory import MemoryGovernor
+from .response import Response, StreamReset
+from ..utils.chat_index import ChatIndex
+from ..utils.response_cache import ResponseCache
+from ..utils.pacing import PacingPolicy
+from ..utils.deadline import with_deadline, bounded_timeout
 
 class BaseLLMProvider(ABC):
-    def __init__(self, browser: BaseBrowser, config: Dict[str, Any]):
+    provider_name = ''
+
+    def __init__(
+        self,
+        browser: BaseBrowser,
+        config: Dict[str, Any],
+        chat_index: Optional[ChatIndex] = None,
+        response_cache: Optional[ResponseCache] = None,
+        pacing: Optional[PacingPolicy] = None
+    ):
         self.browser = browser
         self.config = config
+        self.pacing = pacing or browser.pacing
+        self.chat_index = chat_index
+        self.response_cache = response_cache
+        # Active model per browser tab, and the last model seen in each chat
+        self._tab_models = {}
+        self._chat_models = {}
+        self.latest_response_key = None
+        # Messages already extracted from the open chat, see get_messages
+        self._messages = []
+        self._messages_chat = None
+        # Reloads the page when the conversation's DOM or memory outgrows memory_limits
+        self.memory_governor = MemoryGovernor.from_config(self.config.get('memory_limits'))
+        self.chat_url_pattern = re.compile(rf"{re.escape(self.config.get('chat_base_url', ''))}([^/]+)$")
+        self.browser.cache_locators(self.config[key] for key in self.config.get('cached_selectors', []))
 
     @abstractmethod
     def send_message(self, message: str) -> None:
@@ -20,11 +52,11 @@ class BaseLLMProvider(ABC):
         pass
 
     @abstractmethod
-    def get_response(self) -> str:
+    def get_response(self, artifacts: str = 'lazy') -> Response:
         pass
 
     @abstractmethod
-    def get_responses(self) -> str:
+    def get_responses(self, since: Optional[str] = None) -> List[str]:
         pass
 
     @abstractmethod
@@ -36,7 +68,7 @@ class BaseLLMProvider(ABC):
         pass
 
     @abstractmethod
-    def get_current_model(self) -> str:
+    def get_current_model(self, refresh: bool = False) -> str:
         pass
     
     @abstractmethod
@@ -45,4 +77,314 @@ class BaseLLMProvider(ABC):
 
     @abstractmethod
     def wait_for_response_completion(self, timeout: int = 300) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    @with_deadline('ask')
+    def ask(
+        self,
+        message: str,
+        timeout: int = 300,
+        use_cache: bool = True,
+        context: Optional[str] = None,
+        artifacts: str = 'lazy',
+        **send_kwargs
+    ) -> Optional[Response]:
+        """Send a message, wait for the answer and return the response.
+
+        With a response cache, identical prompts to the same provider and model
+        (and ``context``, e.g. a chat id) are answered without the browser; the
+        cache is skipped when the model cannot be read.
+        ``deadline`` (a ``Deadline`` or seconds) bounds the whole exchange and
+        raises ``DeadlineExceeded`` naming the step that ran out of time.
+        """
+        key = None
+        if use_cache and self.response_cache is not None:
+            # Only read from the page when the tab's model is not known yet
+            model = self.get_current_model()
+            if model:
+                key = self.response_cache.make_key(self.provider_name, model, message, context)
+                cached = self.response_cache.get(key)
+                if cached is not None:
+                    return Response.from_dict(cached)
+            else:
+                print(f'{self.provider_name}: current model unknown, not using the response cache')
+
+        if self.memory_governor is not None:
+            self.memory_governor.check(self)
+        if not self.send_message(message, **send_kwargs):
+            return None
+        if not self.wait_for_response_completion(timeout=timeout):
+            return None
+
+        response = self.get_response(artifacts=artifacts)
+        if key is not None:
+            # Opening lazy artifacts just to cache them would undo artifacts='lazy'
+            self.response_cache.put(key, response.to_dict(loaded_only=True))
+        return response
+
+    def pause(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> float:
+        return self.pacing.delay(operation, min_delay, max_delay)
+
+    def _tab_key(self) -> Optional[str]:
+        if self.browser.current_tab is not None:
+            return self.browser.current_tab
+        try:
+            return self.browser.driver.current_window_handle
+        except WebDriverException:
+            return None
+
+    @property
+    def current_model(self) -> Optional[str]:
+        """Model last selected or read in the current tab, None when it is not known."""
+        return self._tab_models.get(self._tab_key())
+
+    @current_model.setter
+    def current_model(self, model_name: Optional[str]) -> None:
+        self._tab_models[self._tab_key()] = model_name
+        chat_id = self.current_chat_id()
+        if chat_id and model_name:
+            self._chat_models[chat_id] = model_name
+
+    def forget_model(self) -> None:
+        """Reset the tab's model after navigation to what is known about the chat it now shows."""
+        self._tab_models[self._tab_key()] = self._chat_models.get(self.current_chat_id())
+
+    def validate_selectors(self, mode: str = 'report') -> Dict[str, Dict[str, Any]]:
+        """Check every configured locator against the current page in one script call.
+
+        Returns ``{name: {'present', 'count', 'match'}}`` where ``match`` is the
+        index of the first matching fallback. ``mode`` is 'report' (print the
+        missing ``required_selectors``), 'fallback' (also promote the matching
+        fallback of each locator), 'strict' (fallback, then raise
+        ``MissingSelectorsError`` for missing required selectors) or 'off'.
+        Locators of closed menus are reported but never required.
+        """
+        return validate_selectors(self.browser, self.config, mode, label=self.provider_name)
+
+    def navigate(self, url: str, ready: Optional[List[str]] = None) -> bool:
+        """Open ``url`` and wait for the config entries named in ``ready`` (default ``ready_selectors``)."""
+        keys = ready if ready is not None else self.config.get('ready_selectors', [])
+        ready_state = self.browser.navigate(
+            url,
+            [self.config[key] for key in keys],
+            min_wait=self.config.get('ready_min_wait', 0),
+            max_wait=self.config.get('ready_max_wait', 30)
+        )
+        self.forget_model()
+        return ready_state
+
+    def get_messages(self, since: Optional[str] = None) -> List[Dict[str, str]]:
+        """Responses of the open chat after the one keyed ``since`` (all when None) as ``{'key', 'text'}``.
+
+        Keys are the ``message_id_attribute`` of a message or its 1-based
+        position. Extracted messages are cached per chat, so each call only
+        reads the newest message and the ones added since.
+        """
+        chat_id = self.current_chat_id()
+        if chat_id != self._messages_chat:
+            self._messages = []
+            self._messages_chat = chat_id
+
+        locator = self.config['response_xpath']
+        id_attribute = self.config.get('message_id_attribute')
+        cursor = self._messages[-1]['key'] if self._messages else None
+        result = self.browser.read_messages(locator, id_attribute, cursor)
+        if result is None:
+            return []
+        if cursor is not None:
+            if result['cursor_found']:
+                # The last cached message is read again in case it was still growing
+                self._messages.pop()
+            else:
+                # The page no longer shows what was cached, start over
+                self._messages = []
+        self._messages.extend(result['messages'])
+
+        keys = [message['key'] for message in self._messages]
+        if since is None or since not in keys:
+            return list(self._messages)
+        return self._messages[keys.index(since) + 1:]
+
+    def refresh_page(self, recycle: bool = False) -> bool:
+        """Reload the current chat, in a new tab with ``recycle``, and restore its model."""
+        chat_id = self.current_chat_id()
+        model = self.current_model
+        if recycle and self.browser.recycle_tab() is None:
+            return False
+
+        if chat_id:
+            refreshed = self.select_chat(chat_id)
+        else:
+            refreshed = self.navigate(self.config['url'])
+        if refreshed and model:
+            # A no-op when the chat remembers its model
+            refreshed = self.select_model(model)
+        return refreshed
+
+    def current_chat_id(self) -> Optional[str]:
+        match = self.chat_url_pattern.search(self.browser.driver.current_url)
+        return match.group(1) if match else None
+
+    def chats_from_snapshot(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turn ``BaseBrowser.snapshot_elements`` items into chat records."""
+        chats = []
+        for item in items:
+            match = self.chat_url_pattern.search(item['href'] or '')
+            if match:
+                chats.append({
+                    'title': item['title'],
+                    'url': item['href'],
+                    'chat_id': match.group(1)
+                })
+        return chats
+
+    def scan_chats(
+        self,
+        snapshot: Callable[[], List[Dict[str, Any]]],
+        scroll: Callable[[], bool],
+        stop_at_known: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Scroll a chat list until it ends, or until an indexed chat shows up.
+
+        ``snapshot`` returns the chats currently rendered and ``scroll`` loads
+        more of them, returning False once nothing new can be loaded.
+        """
+        stop_at_known = stop_at_known and self.chat_index is not None
+        while True:
+            if stop_at_known:
+                chats = snapshot()
+                if self.chat_index.known_ids(self.provider_name, [chat['chat_id'] for chat in chats]):
+                    return chats
+            if not scroll():
+                return snapshot()
+
+    def iter_chats(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over the indexed chats, newest first."""
+        if self.chat_index is None:
+            yield from self.list_chats()
+            return
+        yield from self.chat_index.iter_chats(self.provider_name, page_size=page_size)
+
+    def install_response_observer(self) -> bool:
+        return self.browser.install_response_observer(
+            self.config['message_xpath'],
+            self.config.get('streaming_xpath'),
+            self.config.get('message_id_attribute')
+        )
+
+    def type_message(self, message: str) -> bool:
+        """Put ``message`` into the input without sending it; ``submit_message`` sends it."""
+        self.arm_response_observer()
+        return self.browser.send_keys(self.config['input_xpath'], message, clear_first=True)
+
+    def submit_message(self, timeout: int = 30) -> bool:
+        return self.browser.click_element(self.config['send_button_xpath'], timeout=timeout)
+
+    def send_pause(self, **send_kwargs) -> float:
+        """Seconds ``send_message`` waits between typing and sending, for callers that schedule it."""
+        return 0.0
+
+    def arm_response_observer(self) -> Optional[str]:
+        """Remember the latest message key so the next completion wait ignores it."""
+        if not self.install_response_observer():
+            return None
+        state = self.browser.get_response_state()
+        self.latest_response_key = state['id'] if state else None
+        return self.latest_response_key
+
+    def poll_response(self, settle: float = 0.5) -> Optional[Dict[str, Any]]:
+        """Check once, without blocking, whether the pending response has completed.
+
+        Returns the observer probe with a ``complete`` flag, or None when the
+        observer is unavailable.
+        """
+        state = self.browser.get_response_state(self.config.get('completion_xpath'))
+        if state is None:
+            # First poll on this page
+            if not self.install_response_observer():
+                return None
+            state = self.browser.get_response_state(self.config.get('completion_xpath'))
+            if state is None:
+                return None
+
+        state['complete'] = (
+            state['id'] is not None
+            and state['id'] != self.latest_response_key
+            and not state['streaming']
+            and state['ready']
+            and state['idle_ms'] >= settle * 1000
+        )
+        if state['complete']:
+            self.latest_response_key = state['id']
+        return state
+
+    def wait_for_observed_completion(self, timeout: int = 300, settle: float = 0.5) -> Optional[bool]:
+        """Wait for completion through the page observer.
+
+        Returns None when the observer is unavailable so callers can fall back
+        to polling.
+        """
+        if not self.install_response_observer():
+            return None
+        state = self.browser.wait_for_response_state(
+            previous_id=self.latest_response_key,
+            completion_locator=self.config.get('completion_xpath'),
+            timeout=timeout,
+            settle=settle
+        )
+        if state is None:
+            return None
+        if state.get('complete'):
+            self.latest_response_key = state['id']
+            return True
+        return False
+
+
+    def stream_response(self, timeout: int = 300, interval: float = 0.5, settle: float = 0.5) -> Iterator[str]:
+        """Yield the text of the pending response as it grows, one delta at a time.
+
+        When the page re-renders text that was already yielded, a
+        ``StreamReset`` with the full current text replaces it.
+        """
+        if not self.install_response_observer():
+            return
+
+        timeout = bounded_timeout(timeout)
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            chunk = self.browser.read_response_delta(
+                previous_id=self.latest_response_key,
+                completion_locator=self.config.get('completion_xpath'),
+                settle=settle
+            )
+            if chunk is None:
+                # The page was replaced underneath us, observe the new one
+                if not self.install_response_observer():
+                    return
+                time.sleep(interval)
+                continue
+
+            if chunk.get('reset'):
+                yield StreamReset(chunk['text'])
+            elif chunk['delta']:
+                yield chunk['delta']
+            if chunk['complete']:
+                self.latest_response_key = chunk['id']
+                return
+            time.sleep(interval)
+
+    def stream_response_with_callback(
+        self,
+        callback: Callable[[str], Any],
+        timeout: int = 300,
+        interval: float = 0.5,
+        settle: float = 0.5
+    ) -> str:
+        """Call ``callback`` with every delta (or ``StreamReset``) and return the full streamed text."""
+        chunks = []
+        for delta in self.stream_response(timeout=timeout, interval=interval, settle=settle):
+            callback(delta)
+            if isinstance(delta, StreamReset):
+                chunks = []
+            chunks.append(delta)
+        return ''.join(chunks)
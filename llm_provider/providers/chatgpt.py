@@ -4,77 +4,100 @@ import time
 from urllib.parse import urljoin
 from typing import Dict, Any, List, Optional
 from .base import BaseLLMProvider
+from .response import Response, ArtifactHandle
 from ..browsers.base import BaseBrowser
+from ..utils.chat_index import ChatIndex
+from ..utils.response_cache import ResponseCache
+from ..utils.pacing import PacingPolicy
+from ..utils.deadline import DeadlineExceeded, with_deadline, bounded_timeout, check_deadline
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from markdownify import markdownify as md
-from bs4 import BeautifulSoup
 from ..utils.preprocessing import *
 
 class ChatGPTProvider(BaseLLMProvider):
-    def __init__(self, browser: BaseBrowser, config: Dict[str, Any]):
-        super().__init__(browser, config)
-        self.browser.driver.get(self.config['url'])
+    provider_name = 'chatgpt'
+
+    def __init__(
+        self,
+        browser: BaseBrowser,
+        config: Dict[str, Any],
+        chat_index: Optional[ChatIndex] = None,
+        response_cache: Optional[ResponseCache] = None,
+        pacing: Optional[PacingPolicy] = None
+    ):
+        super().__init__(browser, config, chat_index, response_cache, pacing)
         self.latest_response_id = None
-        self.browser.random_time_delay(15, 25)
+        self.navigate(self.config['url'])
+        self.validate_selectors(self.config.get('selector_check', 'report'))
 
+    @with_deadline('send_message')
     def send_message(self, message: str, delay: int = 10) -> bool:
-        send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=True)
-        self.browser.random_delay(delay, delay)
-        click_status = self.browser.click_element(self.config['send_button_xpath'], timeout=30)
+        send_status = self.type_message(message)
+        self.pause('before_send', delay, 3)
+        click_status = self.submit_message()
         return send_status and click_status
 
-    def send_message_safely(self, message: str, delay: int = 10, interval: int=5) -> bool:
-        _ = self.browser.send_keys(self.config['input_xpath'], '', clear_first=True)
+    def send_pause(self, delay: int = 10, **send_kwargs) -> float:
+        return self.pacing.sample('before_send', delay, 3)
 
+    @with_deadline('send_message_safely')
+    def send_message_safely(self, message: str, delay: int = 10, interval: int=5, bulk: bool = True) -> bool:
+        self.arm_response_observer()
         messages = preprocess_prompt(message)
-        for message in messages:
-            send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=False)
-            self.browser.random_delay(interval, interval)
-            newline_status = self.browser.send_keys(self.config['input_xpath'], (Keys.SHIFT + Keys.ENTER), clear_first=False)
-            self.browser.random_delay(interval, interval)
 
-            if not (send_status and newline_status):
-                return False
+        # Insert the whole prompt in one operation, only type it line by line as a fallback
+        inserted = bulk and self.browser.insert_text(self.config['input_xpath'], '\n'.join(messages))
+        if not inserted:
+            if bulk:
+                print('Bulk insertion could not be verified, typing line by line')
+            _ = self.browser.send_keys(self.config['input_xpath'], '', clear_first=True)
+
+            for message in messages:
+                send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=False)
+                self.pause('type_line', interval, 3)
+                newline_status = self.browser.send_keys(self.config['input_xpath'], (Keys.SHIFT + Keys.ENTER), clear_first=False)
+                self.pause('type_line', interval, 3)
+
+                if not (send_status and newline_status):
+                    return False
         
-        self.browser.random_delay(delay, delay)
+        self.pause('before_send', delay, 3)
         click_status = self.browser.click_element(self.config['send_button_xpath'], timeout=30)
         return click_status
 
-
     def stop_generating(self, interval: int = 0.5, attempts: int = 2) -> bool:
-        for _ in range(attempts):
-            if self.browser.click_element(self.config['stop_button_xpath']):
-                return True
-            time.sleep(interval)
-        return False
+        return self.browser.click_element(
+            self.config['stop_button_xpath'],
+            retry_count=attempts,
+            retry_delay=interval
+        )
 
-    def get_response(self) -> dict:
-        response_dict = {
-            'chat': {
-                'html': None,
-                'text': None,
-                'markdown': None
-            }, 
-            'canvas': {
-                'html': None,
-                'text': None,
-                'markdown': None
-            }
-        }
-        
+    @with_deadline('get_response')
+    def get_response(self, artifacts: str = 'lazy') -> Response:
+        """
+        Read the latest response.
+
+        ``artifacts`` controls the canvas: 'lazy' returns an ``ArtifactHandle``
+        that opens it on first access, 'eager' opens it right away and 'skip'
+        ignores it.
+        """
         # Find all response elements
         responses = self.browser.find_elements(self.config['response_xpath'])
         if not responses:
-            return response_dict
+            return Response(artifact_key='canvas')
             
-        # Get the latest response element
+        # Get the latest response element, markdown is only converted when read
         latest_response = responses[-1]
-        response_dict['chat']['html'] = latest_response.get_attribute('outerHTML')
-        response_dict['chat']['text'] = latest_response.get_attribute('innerText')
-        response_dict['chat']['markdown'] = md(clean_html_gpt(response_dict['chat']['html']))
+        response = Response(
+            html=latest_response.get_attribute('outerHTML'),
+            text=latest_response.get_attribute('innerText'),
+            rules=self.config['cleanup_rules'],
+            artifact_key='canvas'
+        )
+        if artifacts == 'skip':
+            return response
         
         # Get the parent element to check for canvas indicators
         parent_element = latest_response.find_element(By.XPATH, '..')
@@ -86,50 +109,58 @@ class ChatGPTProvider(BaseLLMProvider):
             sibling_button = None
 
         if sibling_button:
-            # First look for and click the textdoc button
-            try:
-                textdoc_button = self.browser.find_element(self.config['canvas_button_xpath'])
-                if textdoc_button:
-                    textdoc_button.click()
-                    # Add a small delay to allow the section to load
-                    self.browser.random_delay(3, 7)
-            except Exception as e:
-                print(f'Error clicking textdoc button: {e}')
-                return response_dict
-            
-            # Find the editor container by ID
-            header_title = self.browser.find_element(self.config['canvas_title_xpath']).get_attribute('innerText').strip()
-
-            code_canvas_container = self.browser.find_element(self.config['code_canvas_xpath'])
-            text_canvas_container = self.browser.find_element(self.config['text_canvas_xpath'])
-
-            if code_canvas_container:
-                code_language = code_canvas_container.get_attribute('data-language')
-                response_dict['canvas']['html'] = code_canvas_container.get_attribute('outerHTML')
-                response_dict['canvas']['text'] = code_canvas_container.get_attribute('innerText')
-                response_dict['canvas']['markdown'] = f'```{code_language}\n{response_dict["canvas"]["text"]}\n```'
-            elif text_canvas_container:
-                html_content = text_canvas_container.get_attribute('outerHTML')
-                soup = BeautifulSoup(html_content, 'html.parser')
-                target_span = soup.find('span', {
-                    'contenteditable': 'false',
-                    'style': 'position: absolute;'
-                })
-                if target_span and target_span.parent:
-                    target_span.parent.decompose()
-                html_content = str(soup)
-
-                response_dict['canvas']['html'] = html_content
-                response_dict['canvas']['text'] = soup.text
-                response_dict['canvas']['markdown'] = md(clean_html_gpt(html_content))
+            title = (sibling_button.get_attribute('innerText') or '').strip().split('\n')[0] or None
+            handle = ArtifactHandle(0, title=title, loader=self._load_canvas)
+            response.artifacts.append(handle)
+            if artifacts == 'eager':
+                handle.load()
         
-        return response_dict
+        return response
 
-    def get_responses(self) -> List[str]:
-        responses = self.browser.find_elements(self.config['response_xpath'])
-        return [response.get_attribute('innerText') for response in responses]
+    def _load_canvas(self, handle: ArtifactHandle) -> Optional[Response]:
+        # First look for and click the textdoc button
+        try:
+            textdoc_button = self.browser.find_element(self.config['canvas_button_xpath'])
+            if textdoc_button:
+                textdoc_button.click()
+                # Add a small delay to allow the section to load
+                self.pause('open_artifact', 3)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f'Error clicking textdoc button: {e}')
+            return None
+
+        header = self.browser.find_element(self.config['canvas_title_xpath'])
+        if header:
+            handle.title = header.get_attribute('innerText').strip()
+
+        code_canvas_container = self.browser.find_element(self.config['code_canvas_xpath'])
+        if code_canvas_container:
+            handle.type = 'code'
+            code_language = code_canvas_container.get_attribute('data-language')
+            code_text = code_canvas_container.get_attribute('innerText')
+            return Response(
+                html=code_canvas_container.get_attribute('outerHTML'),
+                text=code_text,
+                markdown=f'```{code_language}\n{code_text}\n```'
+            )
+
+        text_canvas_container = self.browser.find_element(self.config['text_canvas_xpath'])
+        if text_canvas_container:
+            handle.type = 'text'
+            return Response(
+                html=text_canvas_container.get_attribute('outerHTML'),
+                rules=self.config['canvas_cleanup_rules']
+            )
+
+        return None
+
+    def get_responses(self, since: Optional[str] = None) -> List[str]:
+        return [message['text'] for message in self.get_messages(since)]
     
-    def list_chats(self) -> List[Dict[str, Any]]:
+    @with_deadline('list_chats')
+    def list_chats(self, full_scan: bool = False) -> List[Dict[str, Any]]:
         chats = []
         sidebar = self.browser.find_element(self.config['sidebar_xpath'])
         if not sidebar:
@@ -139,46 +170,35 @@ class ChatGPTProvider(BaseLLMProvider):
         self.browser.driver.execute_script('arguments[0].scrollTop = 0;', sidebar)
         time.sleep(0.3)
 
-        # Scroll to load all chats
-        while True:
+        def snapshot() -> List[Dict[str, Any]]:
+            # Extract every chat link in a single round trip
+            items = self.browser.snapshot_elements('.//li', include_text=False, root=sidebar)
+            return self.chats_from_snapshot(items)
+
+        def scroll() -> bool:
             self.browser.driver.execute_script('arguments[0].scrollTop += arguments[1];', sidebar, 1000)
             time.sleep(0.5)
-            scroll_height = self.browser.driver.execute_script('return arguments[0].scrollHeight;', sidebar)
-            client_height = self.browser.driver.execute_script('return arguments[0].clientHeight;', sidebar)
-            scroll_position = self.browser.driver.execute_script('return arguments[0].scrollTop;', sidebar)
-            
-            if abs((scroll_height - client_height) - scroll_position) <= 5:
-                break
-
-        # Get chat elements
-        li_elements = sidebar.find_elements(By.TAG_NAME, 'li')
-        for li in li_elements:
-            try:
-                a_element = li.find_element(By.TAG_NAME, 'a')
-                url = a_element.get_attribute('href') if a_element else None
-                title = li.get_attribute('innerText')
-                
-                pattern = rf'{self.config["chat_base_url"]}([^/]+)$'
-                match = re.search(pattern, url)
-
-                if match:
-                    chat_id = match.group(1)
-                    chats.append({
-                        'title': title,
-                        'url': url,
-                        'chat_id': chat_id
-                    })
-            except Exception as e:
-                print(f'Error processing chat element: {e}')
-                continue
-        
-        return chats
+            remaining = self.browser.driver.execute_script(
+                'var el = arguments[0]; return el.scrollHeight - el.clientHeight - el.scrollTop;', sidebar
+            )
+            return abs(remaining) > 5
+
+        # With an index, only scroll until an already indexed chat is rendered
+        chats = self.scan_chats(snapshot, scroll, stop_at_known=not full_scan)
+        if self.chat_index is None:
+            return chats
+
+        self.chat_index.upsert(self.provider_name, chats)
+        return list(self.iter_chats())
 
+    @with_deadline('select_chat')
     def select_chat(self, chat_id: str) -> bool:
         try:
             chat_url = urljoin(self.config['chat_base_url'], chat_id)
-            self.browser.driver.get(chat_url)
+            self.navigate(chat_url)
             return True
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error selecting chat: {e}')
             return False
@@ -200,6 +220,8 @@ class ChatGPTProvider(BaseLLMProvider):
             
             return True  # Already closed, no action needed
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error hiding models menu: {e}')
             return False
@@ -212,7 +234,7 @@ class ChatGPTProvider(BaseLLMProvider):
                 print('Model selector not found')
                 return False
             
-            self.browser.random_delay(2.5, 5.5)
+            self.pause('menu', 2.5, 3)
 
             # Check if menu is already opened
             is_expanded = model_selector.get_attribute('aria-expanded') == 'true'
@@ -228,41 +250,40 @@ class ChatGPTProvider(BaseLLMProvider):
                 return False
             
             # Add random delay
-            self.browser.random_delay(2.5, 5.5)
+            self.pause('menu', 2.5, 3)
             
             if not self.browser.click_element(self.config['more_models_xpath']):
                 print("Failed to click more models")
                 return False
 
-            self.browser.random_delay(2.5, 5.5)
+            self.pause('menu', 2.5, 3)
                 
             return True
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error opening models menu: {e}')
             return False
 
-    def get_current_model(self) -> Optional[str]:
+    @with_deadline('get_current_model')
+    def get_current_model(self, refresh: bool = False) -> Optional[str]:
+        """Return the active model, only opening the model menu when it is not known for this tab and chat."""
+        if not refresh and self.current_model is not None:
+            return self.current_model
+
         try:
-            # Click model selector button
             if not self.open_models_menu():
                 return None
 
-            # Iterate through all model xpaths
-            for model_name, model_xpath in self.config['models'].items():
-                try:
-                    model_element = self.browser.find_element(model_xpath)
-                    if model_element:
-                        # Check if this element contains an SVG
-                        svg_elements = model_element.find_elements(By.TAG_NAME, 'svg')
-                        if svg_elements:
-                            return model_name
-                except Exception as e:
-                    print(f'Error checking model {model_name}: {e}')
-                    continue
+            # The active entry carries a check mark, find it in one snapshot
+            model_name = self.browser.find_marked(self.config['models'], 'svg')
+            if model_name:
+                self.current_model = model_name
+            return model_name
 
-            return None
-            
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error getting current model: {e}')
             return None
@@ -270,11 +291,15 @@ class ChatGPTProvider(BaseLLMProvider):
         finally:
             self.hide_models_menu()
 
+    @with_deadline('select_model')
     def select_model(self, model_name: str) -> bool:
         if model_name not in self.config['models']:
             print(f'Model {model_name} not found in supported models')
             return False
         
+        if self.current_model == model_name:
+            return True
+
         if not self.open_models_menu():
             return False
         
@@ -285,23 +310,32 @@ class ChatGPTProvider(BaseLLMProvider):
             return False
         
         self.hide_models_menu()
-        self.browser.random_delay(5, 5)
+        self.pause('after_select_model', 3, 5)
 
+        self.current_model = model_name
         return True
     
-    def wait_for_response_completion(self, timeout: int = 300, interval: int = 3) -> bool:
+    @with_deadline('wait_for_response_completion')
+    def wait_for_response_completion(self, timeout: int = 300, interval: int = 3, use_observer: bool = True) -> bool:
+        if use_observer:
+            completed = self.wait_for_observed_completion(timeout)
+            if completed is not None:
+                return completed
+
         status = self.check_llm_response_status()
         if status:
+            timeout = bounded_timeout(timeout)
             start_time = time.time()
             prev_response = ''
             while time.time() - start_time < timeout:
-                response = self.get_response()['chat']['text']
+                response = self.get_response(artifacts='skip').text
                 if response != prev_response:
                     prev_response = response
                 else:
                     if self.check_audio_button_status(timeout=1):
                         return True
-                self.browser.random_time_delay(interval)
+                self.pause('poll', interval)
+            check_deadline('waiting for the response to complete')
         return False
     
     def check_send_button_status(self, timeout=10):
@@ -313,17 +347,19 @@ class ChatGPTProvider(BaseLLMProvider):
         return self.browser.is_element_present(self.config['audio_button_xpath'], timeout=timeout)
 
     def check_llm_response_status(self, timeout: int = 10) -> bool:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            response = self.browser.find_element(self.config['response_xpath'], timeout=1)
-            if response:
-                current_id = response.get_attribute('data-message-id')
-                if current_id != self.latest_response_id:
-                    self.latest_response_id = current_id
-                    return True
-            time.sleep(1)
-        return False
+        def new_response() -> bool:
+            responses = self.browser.locate_all(self.config['response_xpath'])
+            if not responses:
+                return False
+            current_id = responses[-1].get_attribute('data-message-id')
+            if current_id != self.latest_response_id:
+                self.latest_response_id = current_id
+                return True
+            return False
+
+        return bool(self.browser.wait_for(new_response, timeout=timeout))
     
+    @with_deadline('upload_file')
     def upload_file(self, path: str) -> bool:
         try:
             path = os.path.abspath(os.path.expanduser(path))
@@ -331,20 +367,22 @@ class ChatGPTProvider(BaseLLMProvider):
             if not input_element:
                 return False
                 
-            file_input = input_element.find_element(By.XPATH, self.config['file_xpath'])
+            file_input = self.browser.locate(self.config['file_xpath'], root=input_element)
             if not file_input:
                 return False
                 
             file_input.send_keys(path)
             return True
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error uploading file: {e}')
             return False
     
+    @with_deadline('wait_for_upload_completion')
     def wait_for_upload_completion(self, timeout: int = 600) -> bool:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.check_send_button_status():
-                return True
-            time.sleep(1)
-        return False
\ No newline at end of file
+        def send_enabled() -> bool:
+            button_element = self.browser.locate(self.config['send_button_xpath'])
+            return bool(button_element) and not button_element.get_attribute('disabled')
+
+        return bool(self.browser.wait_for(send_enabled, timeout=timeout, max_interval=1))
\ No newline at end of file
@@ -2,178 +2,194 @@ import os
 import re
 import time
 from urllib.parse import urljoin
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base import BaseLLMProvider
+from .response import Response, ArtifactHandle
 from ..browsers.base import BaseBrowser
+from ..utils.chat_index import ChatIndex
+from ..utils.response_cache import ResponseCache
+from ..utils.pacing import PacingPolicy
+from ..utils.deadline import DeadlineExceeded, with_deadline, bounded_timeout, check_deadline
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from markdownify import markdownify as md
-from bs4 import BeautifulSoup
 from ..utils.preprocessing import *
 
 class ClaudeProvider(BaseLLMProvider):
-    def __init__(self, browser: BaseBrowser, config: Dict[str, Any]):
-        super().__init__(browser, config)
-        self.browser.driver.get(self.config['url'])
-
+    provider_name = 'claude'
+
+    def __init__(
+        self,
+        browser: BaseBrowser,
+        config: Dict[str, Any],
+        chat_index: Optional[ChatIndex] = None,
+        response_cache: Optional[ResponseCache] = None,
+        pacing: Optional[PacingPolicy] = None
+    ):
+        super().__init__(browser, config, chat_index, response_cache, pacing)
+        self.navigate(self.config['url'])
+        self.validate_selectors(self.config.get('selector_check', 'report'))
+
+    @with_deadline('send_message')
     def send_message(self, message: str) -> bool:
+        self.arm_response_observer()
         send_status = self.browser.send_keys(self.config['input_xpath'], message, clear_first=True)
         click_status = self.browser.click_element(self.config['send_button_xpath'])
         return send_status and click_status
 
     def stop_generating(self, interval:int = 0.5, attempts: int = 2) -> bool:
-        for _ in range(attempts):
-            try:
-                self.browser.click_element(self.config['stop_button_xpath'])
-                return True
-            except:
-                time.sleep(interval)
-        return False
-
-    def get_response(self) -> dict:
-        response_dict = {
-            'chat': {
-                'html': None,
-                'text': None,
-                'markdown': None
-            }, 
-            'artifact': [
+        return self.browser.click_element(
+            self.config['stop_button_xpath'],
+            retry_count=attempts,
+            retry_delay=interval
+        )
 
-            ]
-        }
+    @with_deadline('get_response')
+    def get_response(self, artifacts: str = 'lazy') -> Response:
+        """
+        Read the latest response.
 
+        ``artifacts`` controls artifact retrieval: 'lazy' returns
+        ``ArtifactHandle`` objects that open the artifact on first access,
+        'eager' opens all of them in one pass and 'skip' ignores them.
+        """
         responses = self.browser.find_elements(self.config['response_xpath'])
         if not responses:
-            return response_dict
+            return Response()
         
-        # Get the latest response element
-        latest_response = responses[-1]
-        html_content = latest_response.get_attribute('outerHTML')
-        soup = BeautifulSoup(html_content, 'html.parser')
-        target_span = soup.find('button', {
-            'aria-label': 'Preview contents'
-        })
-        if target_span and target_span.parent:
-            target_span.parent.decompose()
-        html_content = str(soup)
-
-        response_dict['chat']['html'] = html_content
-        response_dict['chat']['text'] = soup.text
-        response_dict['chat']['markdown'] = md(clean_html_claude(response_dict['chat']['html']))
+        # Get the latest response element, it is parsed once and only when read
+        message_index = len(responses) - 1
+        latest_response = responses[message_index]
+        response = Response(
+            html=latest_response.get_attribute('outerHTML'),
+            rules=self.config['cleanup_rules']
+        )
+        if artifacts == 'skip':
+            return response
         
-        if not self.config['artifact_button_xpath'].startswith('.'):
+        # Absolute XPaths would match buttons of every message
+        if isinstance(self.config['artifact_button_xpath'], str) and self.config['artifact_button_xpath'].startswith('/'):
             self.config['artifact_button_xpath'] = f".{self.config['artifact_button_xpath']}"
 
-        try:
-            artifact_buttons = latest_response.find_elements(By.XPATH, self.config['artifact_button_xpath'])
-        except:
-            artifact_buttons = None
+        # Titles of all artifact buttons in one round trip, nothing is clicked yet
+        buttons = self.browser.snapshot_elements(self.config['artifact_button_xpath'], root=latest_response)
+        for artifact_index, button in enumerate(buttons):
+            lines = [line.strip() for line in (button['text'] or '').split('\n') if line.strip()]
+            subtitle = lines[1].lower() if len(lines) > 1 else ''
+            if 'code' in subtitle:
+                artifact_type = 'code'
+            elif subtitle:
+                artifact_type = 'text'
+            else:
+                artifact_type = None
+
+            response.artifacts.append(ArtifactHandle(
+                artifact_index,
+                title=lines[0] if lines else None,
+                type=artifact_type,
+                loader=lambda handle, message_index=message_index: self._load_artifact(message_index, handle)
+            ))
+
+        if artifacts == 'eager':
+            response.load_artifacts()
         
-        if artifact_buttons:
-            for artifact_index in range(len(artifact_buttons)):
-                artifact_buttons = latest_response.find_elements(By.XPATH, self.config['artifact_button_xpath'])
-                if artifact_index >= len(artifact_buttons):
-                    continue
-                artifact_button = artifact_buttons[artifact_index]
-
-                try:
-                    if artifact_button:
-                        self.browser.driver.execute_script('arguments[0].scrollIntoView(true);', artifact_button)
-                        self.browser.random_delay(3, 5)
-                        artifact_button.click()
-                        self.browser.random_delay(5, 10)
-                except Exception as e:
-                    print(f'Error clicking textdoc button: {e}')
-                    continue
-                
-                artifact_response = {
-                    'html': None,
-                    'text': None,
-                    'markdown': None
-                }
-
-                code_artifact = self.browser.find_element(self.config['code_artifact_xpath'])
-                if code_artifact:
-                    code_language = code_artifact.get_attribute('class').replace('language-', '')
-                    artifact_response['html'] = code_artifact.get_attribute('outerHTML')
-                    artifact_response['text'] = code_artifact.get_attribute('innerText')
-                    artifact_response['markdown'] = f'```{code_language}\n{artifact_response["text"]}\n```'
-                    response_dict['artifact'].append(artifact_response)
-                    continue
-
-                text_artifact = self.browser.find_element(self.config['text_artifact_xpath'])
-                if text_artifact:
-                    artifact_response['html'] = text_artifact.get_attribute('outerHTML')
-                    artifact_response['text'] = text_artifact.get_attribute('innerText')
-                    artifact_response['markdown'] = md(artifact_response['html'])
-                    response_dict['artifact'].append(artifact_response)
-                    continue
-
-                iframe_artifact = self.browser.find_element(self.config['iframe_artifact_xpath'])
-                if iframe_artifact:
-                    print('Unsupported iframe artifact!')
-                    # artifact_response['html'] = iframe_artifact.get_attribute('outerHTML')
-                    # artifact_response['text'] = iframe_artifact.get_attribute('innerText')
-                    # artifact_response['markdown'] = md(artifact_response['html'])
-                    # response_dict['artifact'].append(artifact_response)
-                    continue
-        
-        return response_dict
+        return response
 
-    def get_responses(self) -> str:
+    def _load_artifact(self, message_index: int, handle: ArtifactHandle) -> Optional[Response]:
         responses = self.browser.find_elements(self.config['response_xpath'])
-        return [response.get_attribute('innerText') for response in responses]
+        if message_index >= len(responses):
+            return None
+
+        artifact_buttons = self.browser.locate_all(self.config['artifact_button_xpath'], root=responses[message_index])
+        if handle.index >= len(artifact_buttons):
+            return None
+        artifact_button = artifact_buttons[handle.index]
 
-    def list_chats(self) -> list:
+        try:
+            self.browser.driver.execute_script('arguments[0].scrollIntoView(true);', artifact_button)
+            self.pause('scroll_artifact', 3)
+            artifact_button.click()
+            self.pause('open_artifact', 3, 5)
+        except Exception as e:
+            print(f'Error clicking artifact button: {e}')
+            return None
+
+        code_artifact = self.browser.find_element(self.config['code_artifact_xpath'])
+        if code_artifact:
+            handle.type = 'code'
+            code_language = code_artifact.get_attribute('class').replace('language-', '')
+            code_text = code_artifact.get_attribute('innerText')
+            return Response(
+                html=code_artifact.get_attribute('outerHTML'),
+                text=code_text,
+                markdown=f'```{code_language}\n{code_text}\n```'
+            )
+
+        text_artifact = self.browser.find_element(self.config['text_artifact_xpath'])
+        if text_artifact:
+            handle.type = 'text'
+            return Response(
+                html=text_artifact.get_attribute('outerHTML'),
+                text=text_artifact.get_attribute('innerText')
+            )
+
+        iframe_artifact = self.browser.find_element(self.config['iframe_artifact_xpath'])
+        if iframe_artifact:
+            handle.type = 'iframe'
+            print('Unsupported iframe artifact!')
+
+        return None
+
+    def get_responses(self, since: Optional[str] = None) -> List[str]:
+        return [message['text'] for message in self.get_messages(since)]
+
+    @with_deadline('list_chats')
+    def list_chats(self, full_scan: bool = False) -> list:
         original_url = self.browser.driver.current_url
-        chats = []
 
-        self.browser.driver.get(self.config['chat_list_url'])
-        self.browser.wait_presence(self.config['chat_list_xpath'])
+        self.navigate(self.config['chat_list_url'], ready=['chat_list_xpath'])
 
         last_height = self.browser.driver.execute_script('return document.body.scrollHeight')
-        
-        while True:
+
+        def snapshot() -> List[Dict[str, Any]]:
+            items = self.browser.snapshot_elements(
+                self.config['chat_list_xpath'],
+                title_xpath=self.config['chat_title_relative_xpath'],
+                include_text=False
+            )
+            return self.chats_from_snapshot(items)
+
+        def scroll() -> bool:
+            nonlocal last_height
             self.browser.driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
             time.sleep(0.5)
             new_height = self.browser.driver.execute_script('return document.body.scrollHeight')
             if new_height == last_height:
-                break
+                return False
             last_height = new_height
+            return True
+
+        # With an index, only scroll until an already indexed chat is rendered
+        chats = self.scan_chats(snapshot, scroll, stop_at_known=not full_scan)
         
-        li_elements = self.browser.find_elements(self.config['chat_list_xpath'])
-        for li in li_elements:
-            a_element = li.find_element(By.TAG_NAME, 'a')
-            url = a_element.get_attribute('href') if a_element else None
-
-            div_element = a_element.find_element(By.XPATH, './div/div[1]')
-            title = div_element.get_attribute('innerText')
-
-            pattern = rf"{self.config['chat_base_url']}([^/]+)$"
-            match = re.search(pattern, url)
-
-            if match:
-                chat_id = match.group(1)
-                chats.append({
-                    'title' : title, 
-                    'url' : url, 
-                    'chat_id' : chat_id
-                })
-        
-        self.browser.driver.get(original_url)
-        self.browser.random_delay(10, 30)
+        self.navigate(original_url)
 
-        return chats
+        if self.chat_index is None:
+            return chats
 
+        self.chat_index.upsert(self.provider_name, chats)
+        return list(self.iter_chats())
+
+    @with_deadline('select_chat')
     def select_chat(self, chat_id: str) -> bool:
         try:
             chat_url = urljoin(self.config['chat_base_url'], chat_id)
-            self.browser.driver.get(chat_url)
-            self.browser.random_delay(10, 30)
+            self.navigate(chat_url)
             return True
+        except DeadlineExceeded:
+            raise
         except:
             return False
 
@@ -194,6 +210,8 @@ class ClaudeProvider(BaseLLMProvider):
             
             return True  # Already closed, no action needed
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error hiding models menu: {e}')
             return False
@@ -211,7 +229,7 @@ class ClaudeProvider(BaseLLMProvider):
                     print('Failed to click model selector')
                     return False
             
-            self.browser.random_delay(2, 5)
+            self.pause('menu', 2, 3)
 
             more_models = self.browser.find_element(self.config['more_models_xpath'])
             if not more_models:
@@ -221,17 +239,25 @@ class ClaudeProvider(BaseLLMProvider):
             actions = ActionChains(self.browser.driver)
             actions.move_to_element(more_models).perform()
 
-            self.browser.random_delay(2, 5)
+            self.pause('menu', 2, 3)
                 
             return True
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f'Error opening models menu: {e}')
             return False
 
-    def get_current_model(self) -> str:
+    @with_deadline('get_current_model')
+    def get_current_model(self, refresh: bool = False) -> str:
+        """Return the active model, only reading the model button when it is not known for this tab and chat."""
+        if not refresh and self.current_model is not None:
+            return self.current_model
+
         model_element = self.browser.find_element(self.config['model_button_xpath'])
         if not model_element:
+            self.current_model = None
             return ''
             
         current_text = model_element.get_attribute('innerText')
@@ -240,11 +266,17 @@ class ClaudeProvider(BaseLLMProvider):
         for key, model_info in self.config['models'].items():
             model_name = model_info['name'].replace('Claude ', '').strip()
             if current_text == model_name:
+                self.current_model = key
                 return key
                 
+        self.current_model = None
         return ''
 
+    @with_deadline('select_model')
     def select_model(self, model_name: str) -> bool:
+        if self.current_model == model_name:
+            return True
+
         if not self.open_models_menu():
             print('Failed to open models menu')
             return False
@@ -266,28 +298,37 @@ class ClaudeProvider(BaseLLMProvider):
             return False
             
         model_element.click()
-        self.browser.random_delay(5, 7)
+        self.pause('after_select_model', 3, 5)
 
-        current_model = self.get_current_model()
+        # A single read of the model button verifies the switch
+        current_model = self.get_current_model(refresh=True)
 
         self.hide_models_menu()
-        self.browser.random_delay(3, 5)
+        self.pause('menu', 3)
 
         return model_name == current_model
     
-    def wait_for_response_completion(self, timeout: int = 300) -> bool:
+    @with_deadline('wait_for_response_completion')
+    def wait_for_response_completion(self, timeout: int = 300, use_observer: bool = True) -> bool:
+        if use_observer:
+            completed = self.wait_for_observed_completion(timeout)
+            if completed is not None:
+                return completed
+
         status = self.check_llm_response_status()
         if status:
+            timeout = bounded_timeout(timeout)
             start_time = time.time()
             prev_response = ""
             while time.time() - start_time < timeout:
-                response = self.get_response()
+                response = self.get_response(artifacts='skip').text
                 if prev_response != response:
                     prev_response = response
                 else:
                     if self.check_file_button_status(timeout=1):
                         return True
                 time.sleep(0.3)
+            check_deadline('waiting for the response to complete')
             return False
         return False
     
@@ -300,28 +341,26 @@ class ClaudeProvider(BaseLLMProvider):
         return self.browser.is_element_present(self.config['file_button_xpath'], timeout=timeout)
 
     def check_llm_response_status(self, timeout: int = 10) -> bool:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                # Find all response elements using the font-claude-message class
-                responses = self.browser.find_elements(self.config['response_xpath'])
-                if responses:
-                    # Get the last (most recent) response
-                    latest_response = responses[-1]
-                    
-                    # Check streaming status in parent div
-                    parent_div = latest_response.find_element(By.XPATH, './/ancestor::div[@data-is-streaming]')
-                    is_streaming = parent_div.get_attribute('data-is-streaming')
-                    
-                    # Use the response content and streaming status as the identifier
-                    response_text = latest_response.get_attribute('innerText')
-                    current_id = f'{response_text}_{is_streaming}'
-                    
-                    # Compare with stored latest response ID
-                    if not hasattr(self, 'latest_response_id') or current_id != self.latest_response_id:
-                        self.latest_response_id = current_id
-                        return True
-            except Exception as e:
-                pass
-            time.sleep(0.5)
-        return False
\ No newline at end of file
+        def new_response() -> bool:
+            # Find all response elements using the font-claude-message class
+            responses = self.browser.locate_all(self.config['response_xpath'])
+            if not responses:
+                return False
+            # Get the last (most recent) response
+            latest_response = responses[-1]
+            
+            # Check streaming status in parent div
+            parent_div = latest_response.find_element(By.XPATH, './/ancestor::div[@data-is-streaming]')
+            is_streaming = parent_div.get_attribute('data-is-streaming')
+            
+            # Use the response content and streaming status as the identifier
+            response_text = latest_response.get_attribute('innerText')
+            current_id = f'{response_text}_{is_streaming}'
+            
+            # Compare with stored latest response ID
+            if not hasattr(self, 'latest_response_id') or current_id != self.latest_response_id:
+                self.latest_response_id = current_id
+                return True
+            return False
+
+        return bool(self.browser.wait_for(new_response, timeout=timeout))
\ No newline at end of file
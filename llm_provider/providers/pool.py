@@ -0,0 +1,262 @@
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+from ..browsers.base import BaseBrowser
+from ..browsers.waiting import poll_intervals
+from ..utils.deadline import bounded_timeout
+from .base import BaseLLMProvider
+
+class PooledProvider:
+    """Pool bookkeeping for one warm browser and the provider driving it."""
+
+    def __init__(self, slot: int, provider: BaseLLMProvider):
+        self.slot = slot
+        self.provider = provider
+        self.jobs = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def browser(self) -> BaseBrowser:
+        return self.provider.browser
+
+    def __repr__(self) -> str:
+        return f'PooledProvider(slot={self.slot}, provider={self.provider.provider_name}, jobs={self.jobs})'
+
+
+class BrowserPool:
+    """Hands out pre-launched browsers whose provider already has its start page open.
+
+    Every slot gets its own browser from ``browser_factory(slot)``; Chrome
+    locks a whole user data directory to one process, so give each slot its
+    own ``user_data_dir`` (logged in once) or attach each to its own
+    supervised Chrome. Browsers are health checked
+    before every lease and replaced after ``max_jobs`` leases or once their
+    processes use more than ``max_rss_mb`` (measured with psutil when it is
+    installed). With ``refill`` the replacement is launched in the background
+    right away, retried ``refill_attempts`` times with a growing pause::
+
+        pool = BrowserPool(
+            ChatGPTProvider, CONFIG['chatgpt'], size=2,
+            browser_factory=lambda slot: ChromeBrowser(user_data_dir=os.path.expanduser(f'~/LLMProvider/pool/chrome-{slot}'))
+        )
+        pool.start()
+        with pool.lease() as chatgpt:
+            response = chatgpt.ask('Hello')
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        provider_class: Type[BaseLLMProvider],
+        config: Dict[str, Any],
+        browser_factory: Callable[[int], BaseBrowser],
+        size: int = 1,
+        max_jobs: Optional[int] = 50,
+        max_rss_mb: Optional[float] = None,
+        health_selectors: Optional[List[str]] = None,
+        reset: bool = True,
+        refill: bool = True,
+        refill_attempts: int = 5,
+        **provider_kwargs
+    ):
+        self.provider_class = provider_class
+        self.config = config
+        self.browser_factory = browser_factory
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        # Config entries that must be present, e.g. the prompt input only shows when logged in
+        self.health_selectors = health_selectors if health_selectors is not None else config.get(
+            'required_selectors', ['input_xpath']
+        )
+        self.reset = reset
+        # Relaunch discarded browsers in the background so the next lease stays warm
+        self.refill = refill
+        self.refill_attempts = refill_attempts
+        self.provider_kwargs = provider_kwargs
+        self._idle = queue.Queue()
+        self._free_slots = list(range(size))
+        self._leased = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'leases': 0, 'refill_failures': 0}
+
+    def _create(self, slot: int) -> Optional[PooledProvider]:
+        browser = None
+        try:
+            browser = self.browser_factory(slot)
+            provider = self.provider_class(browser, self.config, **self.provider_kwargs)
+        except Exception as e:
+            print(f'Failed to start pool slot {slot}: {e}')
+            if browser is not None:
+                self._close_browser(browser)
+            return None
+        self.stats['created'] += 1
+        return PooledProvider(slot, provider)
+
+    def _close_browser(self, browser: BaseBrowser) -> None:
+        try:
+            browser.close()
+        except Exception as e:
+            print(f'Error closing pooled browser: {e}')
+
+    def _discard(self, entry: PooledProvider) -> None:
+        """Close ``entry``'s browser and warm up a replacement for its slot in the background."""
+        if self.refill and not self._closed:
+            threading.Thread(target=self._refill, args=(entry,), name=f'pool-refill-{entry.slot}', daemon=True).start()
+            return
+        self._close_browser(entry.browser)
+        with self._lock:
+            self._free_slots.append(entry.slot)
+
+    def _refill(self, entry: PooledProvider) -> None:
+        self._close_browser(entry.browser)
+        retry_intervals = poll_intervals(0.5, 5.0, 2.0)
+        for attempt in range(self.refill_attempts):
+            if self._closed:
+                break
+            replacement = self._create(entry.slot)
+            if replacement is not None:
+                with self._lock:
+                    # close() may have drained the idle queue meanwhile
+                    if not self._closed:
+                        self._idle.put(replacement)
+                        return
+                self._close_browser(replacement.browser)
+                break
+            self.stats['refill_failures'] += 1
+            if attempt + 1 < self.refill_attempts:
+                time.sleep(next(retry_intervals))
+        # Leave the slot to be launched on demand by acquire() or start()
+        with self._lock:
+            self._free_slots.append(entry.slot)
+
+    def start(self) -> int:
+        """Launch the browsers of every free slot; returns how many are ready."""
+        while True:
+            with self._lock:
+                if self._closed or not self._free_slots:
+                    break
+                slot = self._free_slots.pop(0)
+            entry = self._create(slot)
+            if entry is None:
+                with self._lock:
+                    self._free_slots.append(slot)
+                break
+            self._idle.put(entry)
+        return self._idle.qsize()
+
+    def is_healthy(self, entry: PooledProvider) -> bool:
+        """The driver answers and every health selector is present."""
+        if not entry.browser.is_responsive():
+            return False
+        if not self.health_selectors:
+            return True
+        report = entry.browser.check_locators({key: self.config[key] for key in self.health_selectors})
+        return all(report.get(key, {}).get('present') for key in self.health_selectors)
+
+    def needs_recycling(self, entry: PooledProvider) -> bool:
+        if self.max_jobs is not None and entry.jobs >= self.max_jobs:
+            return True
+        if self.max_rss_mb is not None:
+            rss = entry.browser.get_process_rss()
+            if rss is not None and rss / 2 ** 20 > self.max_rss_mb:
+                return True
+        return False
+
+    def acquire(self, timeout: float = 60) -> BaseLLMProvider:
+        """Lease a healthy provider, launching one when a slot is free. Pair with ``release``.
+
+        Failed launches and health checks are retried with a growing pause.
+        """
+        end_time = time.monotonic() + bounded_timeout(timeout)
+        retry_intervals = poll_intervals(0.5, 5.0, 2.0)
+        while True:
+            if self._closed:
+                raise RuntimeError('Browser pool is closed')
+
+            entry = None
+            failed = False
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    slot = self._free_slots.pop(0) if self._free_slots else None
+                if slot is not None:
+                    entry = self._create(slot)
+                    if entry is None:
+                        failed = True
+                        with self._lock:
+                            self._free_slots.append(slot)
+                else:
+                    try:
+                        entry = self._idle.get(timeout=max(min(end_time - time.monotonic(), 1.0), 0))
+                    except queue.Empty:
+                        pass
+
+            if entry is not None:
+                if self.is_healthy(entry):
+                    with self._lock:
+                        self._leased[id(entry.provider)] = entry
+                    self.stats['leases'] += 1
+                    return entry.provider
+                print(f'Replacing unhealthy {entry}')
+                self.stats['unhealthy'] += 1
+                self._discard(entry)
+                failed = True
+
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'No healthy browser available within {timeout}s')
+            if failed:
+                time.sleep(min(next(retry_intervals), remaining))
+
+    def release(self, provider: BaseLLMProvider, broken: bool = False) -> None:
+        """Return a leased provider; ``broken`` ones are closed instead of reused."""
+        with self._lock:
+            entry = self._leased.pop(id(provider))
+        entry.jobs += 1
+
+        if self._closed or broken or self.needs_recycling(entry):
+            if not broken and not self._closed:
+                self.stats['recycled'] += 1
+            self._discard(entry)
+            return
+
+        # Leave the next job on a fresh conversation
+        if self.reset and provider.current_chat_id() is not None:
+            if not provider.navigate(self.config['url']):
+                self._discard(entry)
+                return
+        self._idle.put(entry)
+
+    @contextmanager
+    def lease(self, timeout: float = 60) -> Iterator[BaseLLMProvider]:
+        """Context manager around ``acquire``/``release``; a browser that stopped answering is discarded."""
+        provider = self.acquire(timeout)
+        try:
+            yield provider
+        except BaseException:
+            self.release(provider, broken=not provider.browser.is_responsive())
+            raise
+        self.release(provider)
+
+    def close(self) -> None:
+        """Shut down every idle browser; leased ones are closed when they are released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(entry)
+
+    def __enter__(self) -> 'BrowserPool':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
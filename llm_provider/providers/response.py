@@ -0,0 +1,222 @@
+from typing import Dict, Any, List, Optional, Callable, Union
+from ..utils.preprocessing import parse_html, soup_to_html, soup_to_text, soup_to_markdown
+
+_UNSET = object()
+
+class Response:
+    """A provider response whose html, text, markdown and code blocks are computed on demand.
+
+    The HTML is parsed at most once, the first time a derived field is read,
+    and every field is memoized. ``to_dict()`` (and item access) returns the
+    legacy ``{'chat': ..., 'canvas' | 'artifact': ...}`` layout.
+    """
+
+    __slots__ = (
+        'raw_html',
+        'rules',
+        'artifacts',
+        'artifact_key',
+        '_soup',
+        '_html',
+        '_text',
+        '_markdown',
+        '_code_blocks',
+    )
+
+    def __init__(
+        self,
+        html: Optional[str] = None,
+        text: Optional[str] = _UNSET,
+        markdown: Optional[str] = _UNSET,
+        rules: Optional[List[Dict[str, Any]]] = None,
+        artifacts: Optional[List[Union['Response', 'ArtifactHandle']]] = None,
+        artifact_key: str = 'artifact'
+    ):
+        self.raw_html = html
+        self.rules = rules
+        self.artifacts = artifacts if artifacts is not None else []
+        self.artifact_key = artifact_key
+        self._soup = None
+        self._html = _UNSET
+        self._text = text
+        self._markdown = markdown
+        self._code_blocks = _UNSET
+
+    def _tree(self):
+        if self._soup is None:
+            self._soup = parse_html(self.raw_html, self.rules)
+        return self._soup
+
+    @property
+    def html(self) -> Optional[str]:
+        if self._html is _UNSET:
+            if self.raw_html is None or not self.rules:
+                self._html = self.raw_html
+            else:
+                self._html = soup_to_html(self._tree())
+        return self._html
+
+    @property
+    def text(self) -> Optional[str]:
+        if self._text is _UNSET:
+            self._text = None if self.raw_html is None else soup_to_text(self._tree())
+        return self._text
+
+    @property
+    def markdown(self) -> Optional[str]:
+        if self._markdown is _UNSET:
+            self._markdown = None if self.raw_html is None else soup_to_markdown(self._tree())
+        return self._markdown
+
+    @property
+    def code_blocks(self) -> List[Dict[str, Optional[str]]]:
+        if self._code_blocks is _UNSET:
+            blocks = []
+            if self.raw_html is not None:
+                for pre in self._tree().find_all('pre'):
+                    code = pre.find('code') or pre
+                    language = None
+                    for css_class in code.get('class') or []:
+                        if css_class.startswith('language-'):
+                            language = css_class[len('language-'):]
+                            break
+                    blocks.append({'language': language, 'code': code.get_text()})
+            self._code_blocks = blocks
+        return self._code_blocks
+
+    def _fields(self) -> Dict[str, Optional[str]]:
+        return {
+            'html': self.html,
+            'text': self.text,
+            'markdown': self.markdown
+        }
+
+    def _artifacts_value(self, loaded_only: bool = False):
+        artifacts = [
+            artifact._fields() for artifact in self.artifacts
+            if not (loaded_only and isinstance(artifact, ArtifactHandle) and not artifact.loaded)
+        ]
+        if self.artifact_key == 'canvas':
+            # ChatGPT has at most one canvas and always reported the slot
+            return artifacts[0] if artifacts else {'html': None, 'text': None, 'markdown': None}
+        return artifacts
+
+    def load_artifacts(self) -> List[Optional['Response']]:
+        """Fetch every artifact that is still a lazy handle in a single pass."""
+        return [
+            artifact.load() if isinstance(artifact, ArtifactHandle) else artifact
+            for artifact in self.artifacts
+        ]
+
+    def to_dict(self, loaded_only: bool = False) -> Dict[str, Any]:
+        """``loaded_only`` leaves out artifact handles that were never opened instead of loading them."""
+        return {
+            'chat': self._fields(),
+            self.artifact_key: self._artifacts_value(loaded_only)
+        }
+
+    def __getitem__(self, key: str):
+        if key == 'chat':
+            return self._fields()
+        if key == self.artifact_key:
+            return self._artifacts_value()
+        raise KeyError(key)
+
+    @classmethod
+    def from_dict(cls, response_dict: Dict[str, Any]) -> 'Response':
+        """Rebuild a response from ``to_dict()`` output, e.g. a cache entry."""
+        def from_fields(fields: Dict[str, Any], **kwargs) -> 'Response':
+            return cls(
+                html=fields.get('html'),
+                text=fields.get('text'),
+                markdown=fields.get('markdown'),
+                **kwargs
+            )
+
+        artifact_key = 'canvas' if 'canvas' in response_dict else 'artifact'
+        artifacts = response_dict.get(artifact_key) or []
+        if isinstance(artifacts, dict):
+            artifacts = [artifacts] if artifacts.get('html') is not None else []
+
+        return from_fields(
+            response_dict.get('chat') or {},
+            artifacts=[from_fields(artifact) for artifact in artifacts],
+            artifact_key=artifact_key
+        )
+
+    def __repr__(self) -> str:
+        size = len(self.raw_html) if self.raw_html is not None else 0
+        return f'Response(html={size} chars, {self.artifact_key}={len(self.artifacts)})'
+
+
+class StreamReset(str):
+    """Full response text yielded by ``stream_response`` when the page re-rendered earlier text.
+
+    It replaces everything streamed before it rather than extending it.
+    """
+
+    __slots__ = ()
+
+
+class ArtifactHandle:
+    """Lightweight reference to a canvas or artifact whose content is fetched on demand.
+
+    ``loader`` is called with the handle the first time the content is needed
+    and returns a ``Response`` (or None when it could not be opened). It may
+    refine ``type`` once the artifact has been seen.
+    """
+
+    __slots__ = ('index', 'title', 'type', '_loader', '_content', '_loaded')
+
+    def __init__(
+        self,
+        index: int,
+        title: Optional[str] = None,
+        type: Optional[str] = None,
+        loader: Optional[Callable[['ArtifactHandle'], Optional[Response]]] = None
+    ):
+        self.index = index
+        self.title = title
+        self.type = type
+        self._loader = loader
+        self._content = None
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> Optional[Response]:
+        if not self._loaded:
+            self._content = self._loader(self) if self._loader else None
+            self._loaded = True
+        return self._content
+
+    @property
+    def content(self) -> Optional[Response]:
+        return self.load()
+
+    @property
+    def html(self) -> Optional[str]:
+        content = self.load()
+        return content.html if content else None
+
+    @property
+    def text(self) -> Optional[str]:
+        content = self.load()
+        return content.text if content else None
+
+    @property
+    def markdown(self) -> Optional[str]:
+        content = self.load()
+        return content.markdown if content else None
+
+    def _fields(self) -> Dict[str, Optional[str]]:
+        return {
+            'html': self.html,
+            'text': self.text,
+            'markdown': self.markdown
+        }
+
+    def __repr__(self) -> str:
+        return f'ArtifactHandle(index={self.index}, title={self.title!r}, type={self.type!r}, loaded={self._loaded})'
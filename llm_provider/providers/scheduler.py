@@ -0,0 +1,194 @@
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Type
+from selenium.common.exceptions import WebDriverException
+from ..browsers.base import BaseBrowser
+from ..utils.deadline import DeadlineExceeded
+from .base import BaseLLMProvider
+from .response import Response
+
+class ConversationTab:
+    """One browser tab bound to a provider (and optionally a chat), with its queue of prompts."""
+
+    def __init__(self, handle: str, provider: BaseLLMProvider, chat_id: Optional[str] = None):
+        self.handle = handle
+        self.provider = provider
+        self.chat_id = chat_id
+        self.pending: Deque[Dict[str, Any]] = deque()
+        self.results: List[Optional[Response]] = []
+        self.active: Optional[Dict[str, Any]] = None
+        self.next_poll = 0.0
+        self.poll_interval = 0.0
+        self.last_length = None
+
+    @property
+    def busy(self) -> bool:
+        return self.active is not None or bool(self.pending)
+
+    def submit(self, message: str, timeout: float = 300, artifacts: str = 'lazy', **send_kwargs) -> None:
+        """Queue ``message``; its response is appended to ``results`` (None on failure).
+
+        ``send_kwargs`` (e.g. ChatGPT's ``delay``) shape the before-send pause.
+        """
+        self.pending.append({
+            'message': message,
+            'timeout': timeout,
+            'artifacts': artifacts,
+            'send_kwargs': send_kwargs
+        })
+
+    def __repr__(self) -> str:
+        return f'ConversationTab({self.provider.provider_name}, chat={self.chat_id!r}, pending={len(self.pending)})'
+
+
+class TabScheduler:
+    """Drives several conversations in the tabs of one browser.
+
+    Only one tab can be driven at a time, but answers are generated server
+    side. The scheduler types queued prompts, submits them once their
+    before-send pause is over (driving other tabs meanwhile), then polls each
+    waiting tab with a single observer probe, backing off while nothing
+    changes, and only switches to a tab when it has something to do::
+
+        scheduler = TabScheduler(chrome_browser)
+        gpt = scheduler.open_tab(ChatGPTProvider, CONFIG['chatgpt'])
+        claude = scheduler.open_tab(ClaudeProvider, CONFIG['claude'])
+        gpt.submit('Summarize Hamlet.')
+        claude.submit('Summarize Macbeth.')
+        scheduler.run()
+        print(gpt.results, claude.results)
+    """
+
+    def __init__(
+        self,
+        browser: BaseBrowser,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 2.0,
+        settle: float = 0.5,
+        on_response: Optional[Callable[[ConversationTab, Optional[Response]], Any]] = None
+    ):
+        self.browser = browser
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.settle = settle
+        self.on_response = on_response
+        self.tabs: List[ConversationTab] = []
+
+    def open_tab(
+        self,
+        provider_class: Type[BaseLLMProvider],
+        config: Dict[str, Any],
+        chat_id: Optional[str] = None,
+        **provider_kwargs
+    ) -> ConversationTab:
+        """Open a tab (the current window for the first one) running ``provider_class``."""
+        if not self.tabs:
+            self.browser.switch_to_tab(self.browser.driver.current_window_handle)
+            handle = self.browser.current_tab
+        else:
+            handle = self.browser.open_tab()
+
+        provider = provider_class(self.browser, config, **provider_kwargs)
+        if chat_id:
+            provider.select_chat(chat_id)
+        tab = ConversationTab(handle, provider, chat_id)
+        self.tabs.append(tab)
+        return tab
+
+    def close_tab(self, tab: ConversationTab) -> None:
+        self.tabs.remove(tab)
+        self.browser.close_tab(tab.handle)
+        if self.tabs:
+            self.browser.switch_to_tab(self.tabs[0].handle)
+
+    def _finish(self, tab: ConversationTab, response: Optional[Response]) -> None:
+        tab.active = None
+        tab.results.append(response)
+        if self.on_response is not None:
+            self.on_response(tab, response)
+
+    def _send(self, tab: ConversationTab) -> None:
+        """Type the next prompt; it is submitted once its before-send pause is over."""
+        job = tab.pending.popleft()
+        self.browser.switch_to_tab(tab.handle)
+        if not tab.provider.type_message(job['message']):
+            print(f'Failed to send message in {tab}')
+            self._finish(tab, None)
+            return
+        # Other tabs are driven during the pause instead of sleeping through it
+        job['submit_at'] = time.monotonic() + tab.provider.send_pause(**job['send_kwargs'])
+        job['started'] = None
+        tab.active = job
+        tab.next_poll = job['submit_at']
+
+    def _submit(self, tab: ConversationTab) -> None:
+        job = tab.active
+        self.browser.switch_to_tab(tab.handle)
+        if not tab.provider.submit_message():
+            print(f'Failed to send message in {tab}')
+            self._finish(tab, None)
+            return
+        job['started'] = time.monotonic()
+        tab.poll_interval = self.poll_interval
+        tab.next_poll = time.monotonic() + self.poll_interval
+        tab.last_length = None
+
+    def _poll(self, tab: ConversationTab) -> None:
+        job = tab.active
+        self.browser.switch_to_tab(tab.handle)
+        state = tab.provider.poll_response(self.settle)
+
+        if state is None:
+            # No observer on this page, fall back to the provider's blocking wait
+            completed = tab.provider.wait_for_response_completion(
+                timeout=max(job['timeout'] - (time.monotonic() - job['started']), 0)
+            )
+            self._finish(tab, tab.provider.get_response(artifacts=job['artifacts']) if completed else None)
+            return
+
+        if state['complete']:
+            self._finish(tab, tab.provider.get_response(artifacts=job['artifacts']))
+            return
+
+        if time.monotonic() - job['started'] > job['timeout']:
+            print(f'Timed out waiting for the response in {tab}')
+            self._finish(tab, None)
+            return
+
+        # Poll quickly while the answer grows, back off while nothing changes
+        if state['length'] != tab.last_length:
+            tab.poll_interval = self.poll_interval
+        else:
+            tab.poll_interval = min(tab.poll_interval * 2, self.max_poll_interval)
+        tab.last_length = state['length']
+        tab.next_poll = time.monotonic() + tab.poll_interval
+
+    def step(self) -> bool:
+        """Do every piece of work that is due now. Returns whether anything is left to do."""
+        for tab in list(self.tabs):
+            try:
+                if tab.active is None and tab.pending:
+                    self._send(tab)
+                elif tab.active is not None and time.monotonic() >= tab.next_poll:
+                    if tab.active['started'] is None:
+                        self._submit(tab)
+                    else:
+                        self._poll(tab)
+            except DeadlineExceeded:
+                raise
+            except WebDriverException as e:
+                print(f'Browser error in {tab}: {e}')
+                self._finish(tab, None)
+        return any(tab.busy for tab in self.tabs)
+
+    def run(self, timeout: Optional[float] = None) -> Dict[str, List[Optional[Response]]]:
+        """Process every queued prompt of every tab; returns the results by tab handle."""
+        end_time = None if timeout is None else time.monotonic() + timeout
+        while self.step():
+            if end_time is not None and time.monotonic() >= end_time:
+                print(f'Scheduler stopped after {timeout}s with work left')
+                break
+            waiting = [tab.next_poll for tab in self.tabs if tab.active is not None]
+            if waiting and not any(tab.active is None and tab.pending for tab in self.tabs):
+                time.sleep(max(min(waiting) - time.monotonic(), 0))
+        return {tab.handle: tab.results for tab in self.tabs}
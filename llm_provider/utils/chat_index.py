@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Set
+
+class ChatIndex:
+    """Persistent SQLite index of chats keyed by provider and chat id.
+
+    Chats are ordered newest first with a monotonically increasing sort key, so
+    chats found at the top of the sidebar during a later sync rank above the
+    ones already indexed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), "LLMProvider", "chat_index.sqlite3")
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chats (
+                provider TEXT NOT NULL,
+                chat_id TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
+                sort_key INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (provider, chat_id)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS chats_order ON chats (provider, sort_key)"
+        )
+        self._conn.commit()
+
+    def known_ids(self, provider: str, chat_ids: Iterable[str]) -> Set[str]:
+        chat_ids = list(chat_ids)
+        if not chat_ids:
+            return set()
+        placeholders = ','.join('?' * len(chat_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT chat_id FROM chats WHERE provider = ? AND chat_id IN ({placeholders})",
+                [provider, *chat_ids]
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def contains(self, provider: str, chat_id: str) -> bool:
+        return bool(self.known_ids(provider, [chat_id]))
+
+    def upsert(self, provider: str, chats: List[Dict[str, Any]]) -> int:
+        """Insert new chats above the indexed ones and refresh known titles.
+
+        ``chats`` is expected in sidebar order (newest first). Returns the
+        number of chats that were not indexed before.
+        """
+        known = self.known_ids(provider, [chat['chat_id'] for chat in chats])
+        new_chats = [chat for chat in chats if chat['chat_id'] not in known]
+        now = time.time()
+
+        with self._lock:
+            top = self._conn.execute(
+                "SELECT COALESCE(MAX(sort_key), 0) FROM chats WHERE provider = ?", (provider,)
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO chats (provider, chat_id, title, url, sort_key, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (provider, chat['chat_id'], chat['title'], chat['url'], top + len(new_chats) - i, now)
+                    for i, chat in enumerate(new_chats)
+                ]
+            )
+            self._conn.executemany(
+                "UPDATE chats SET title = ?, url = ?, updated_at = ? WHERE provider = ? AND chat_id = ?",
+                [
+                    (chat['title'], chat['url'], now, provider, chat['chat_id'])
+                    for chat in chats if chat['chat_id'] in known
+                ]
+            )
+            self._conn.commit()
+        return len(new_chats)
+
+    def remove(self, provider: str, chat_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chats WHERE provider = ? AND chat_id = ?", (provider, chat_id))
+            self._conn.commit()
+
+    def count(self, provider: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM chats WHERE provider = ?", (provider,)
+            ).fetchone()[0]
+
+    def page(self, provider: str, limit: int = 100, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` chats older than the ``before`` sort key."""
+        query = "SELECT chat_id, title, url, sort_key FROM chats WHERE provider = ?"
+        params: List[Any] = [provider]
+        if before is not None:
+            query += " AND sort_key < ?"
+            params.append(before)
+        query += " ORDER BY sort_key DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {'title': title, 'url': url, 'chat_id': chat_id, 'sort_key': sort_key}
+            for chat_id, title, url, sort_key in rows
+        ]
+
+    def iter_chats(self, provider: str, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over all indexed chats, newest first, one page at a time."""
+        before = None
+        while True:
+            chats = self.page(provider, limit=page_size, before=before)
+            if not chats:
+                return
+            yield from chats
+            before = chats[-1]['sort_key']
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
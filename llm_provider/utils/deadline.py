@@ -0,0 +1,147 @@
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Optional, Union, Iterator
+from selenium.common.exceptions import TimeoutException
+
+_active_deadline = contextvars.ContextVar('llm_provider_deadline', default=None)
+
+class DeadlineExceeded(TimeoutException):
+    """Raised when a ``Deadline`` runs out.
+
+    ``step`` names the provider operation that was running, ``detail`` the
+    wait inside it that exhausted the budget.
+    """
+
+    def __init__(self, step: str, budget: float, elapsed: float, detail: str = '', cancelled: bool = False):
+        self.step = step
+        self.budget = budget
+        self.elapsed = elapsed
+        self.detail = detail
+        self.cancelled = cancelled
+        if cancelled:
+            message = f'{step or "Operation"} cancelled after {elapsed:.1f}s'
+        else:
+            message = f'Deadline of {budget:.1f}s exhausted in {step or "operation"} after {elapsed:.1f}s'
+        if detail:
+            message += f' ({detail})'
+        super().__init__(message)
+
+class Deadline:
+    """Time budget shared by every wait of one logical operation.
+
+    Activate it with ``use_deadline`` (or pass ``deadline=`` to a provider
+    method); every ``BaseBrowser`` wait, retry and pacing pause then only
+    gets what is left of the budget::
+
+        provider.ask('Hello', deadline=60)
+    """
+
+    def __init__(self, budget: float = float('inf')):
+        self.budget = float(budget)
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + self.budget
+        self.step = ''
+        # Enclosing deadline, whose cancellation also ends this one
+        self.parent = None
+        self._cancelled = False
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        remaining = max(self.expires_at - time.monotonic(), 0.0)
+        if self.parent is not None:
+            remaining = min(remaining, self.parent.remaining())
+        return remaining
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled or (self.parent is not None and self.parent.cancelled)
+
+    def clamp(self, timeout: float) -> float:
+        """Return ``timeout`` limited to the remaining budget."""
+        return min(timeout, self.remaining())
+
+    def cancel(self) -> None:
+        """Expire the deadline now, so the operation stops at its next wait."""
+        self._cancelled = True
+        self.expires_at = time.monotonic()
+
+    def exceeded(self, detail: str = '') -> DeadlineExceeded:
+        return DeadlineExceeded(self.step, self.budget, self.elapsed(), detail, self.cancelled)
+
+    def check(self, detail: str = '') -> None:
+        """Raise ``DeadlineExceeded`` if the budget is used up."""
+        if self.expired:
+            raise self.exceeded(detail)
+
+    def __repr__(self) -> str:
+        return f'Deadline(budget={self.budget}, remaining={self.remaining():.1f}, step={self.step!r})'
+
+def current_deadline() -> Optional[Deadline]:
+    return _active_deadline.get()
+
+def bounded_timeout(timeout: float) -> float:
+    """Return ``timeout`` limited to what is left of the active deadline."""
+    deadline = _active_deadline.get()
+    return timeout if deadline is None else deadline.clamp(timeout)
+
+def check_deadline(detail: str = '') -> None:
+    deadline = _active_deadline.get()
+    if deadline is not None:
+        deadline.check(detail)
+
+@contextmanager
+def use_deadline(deadline: Union[Deadline, float, None]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` (a ``Deadline`` or a budget in seconds) active for the block.
+
+    An enclosing deadline that expires earlier stays in charge, so nested
+    calls can only shrink the budget.
+    """
+    outer = _active_deadline.get()
+    if deadline is None:
+        yield outer
+        return
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    if outer is not None and outer.expires_at <= deadline.expires_at:
+        yield outer
+        return
+
+    deadline.parent = outer
+    token = _active_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _active_deadline.reset(token)
+
+@contextmanager
+def deadline_step(step: str) -> Iterator[None]:
+    """Record ``step`` as the running operation of the active deadline."""
+    deadline = _active_deadline.get()
+    if deadline is None:
+        yield
+        return
+    previous = deadline.step
+    deadline.step = step
+    try:
+        yield
+    finally:
+        deadline.step = previous
+
+def with_deadline(step: str):
+    """Let a method take a ``deadline`` keyword and run as ``step`` of it."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, deadline: Union[Deadline, float, None] = None, **kwargs):
+            with use_deadline(deadline), deadline_step(step):
+                check_deadline()
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,24 @@
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Return module ``__getattr__`` and ``__dir__`` functions that import ``exports`` on first access.
+
+    ``exports`` maps each public name to the relative module defining it, so
+    importing a package does not load the dependencies of every submodule::
+
+        __getattr__, __dir__ = lazy_exports(__name__, {'ChromeBrowser': '.chrome'})
+    """
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(exports[name], package)
+        value = getattr(module, name)
+        # Cache on the package so later lookups skip this hook
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(exports))
+
+    return __getattr__, __dir__
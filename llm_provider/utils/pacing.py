@@ -0,0 +1,80 @@
+import os
+import time
+import random
+from typing import Dict, Any, Optional, Tuple, Callable
+from .deadline import bounded_timeout
+
+PACING_ENV_VAR = 'LLM_PROVIDER_PACING'
+
+class PacingPolicy:
+    """Central source of every artificial delay.
+
+    Call sites name an operation and pass their default range. The active
+    profile may override the range per operation and scales the result, so a
+    ``test`` profile with ``scale: 0`` removes all artificial delays.
+
+    Profile layout in config::
+
+        pacing:
+          profile: interactive
+          profiles:
+            batch:
+              scale: 0.5
+              operations:
+                type_line: [0.2, 0.5]
+    """
+
+    def __init__(
+        self,
+        profile: str = 'interactive',
+        profiles: Optional[Dict[str, Any]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if profiles is None:
+            from ..config import CONFIG
+            profiles = CONFIG.get('pacing', {}).get('profiles', {})
+        if profile not in profiles:
+            print(f'Unknown pacing profile {profile}, using unscaled defaults')
+        settings = profiles.get(profile) or {}
+
+        self.profile = profile
+        self.scale = float(settings.get('scale', 1.0))
+        self.operations = settings.get('operations') or {}
+        self._sleep = sleep
+        self.total_delay = 0.0
+
+    @classmethod
+    def from_config(cls, profile: Optional[str] = None) -> 'PacingPolicy':
+        """Build the policy for ``profile``, the LLM_PROVIDER_PACING variable or the configured default."""
+        from ..config import CONFIG
+        pacing_config = CONFIG.get('pacing', {})
+        profile = profile or os.environ.get(PACING_ENV_VAR) or pacing_config.get('profile', 'interactive')
+        return cls(profile, pacing_config.get('profiles', {}))
+
+    def budget(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> Tuple[float, float]:
+        """Return the scaled (min, max) delay range for ``operation``."""
+        override = self.operations.get(operation)
+        if isinstance(override, (list, tuple)):
+            min_delay, max_delay = override[0], override[-1]
+        elif override is not None:
+            min_delay = max_delay = override
+        if max_delay is None:
+            max_delay = min_delay
+        low, high = sorted((float(min_delay), float(max_delay)))
+        return low * self.scale, high * self.scale
+
+    def sample(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> float:
+        """Pick a duration within the operation budget without sleeping, e.g. to schedule it."""
+        low, high = self.budget(operation, min_delay, max_delay)
+        return bounded_timeout(random.uniform(low, high))
+
+    def delay(self, operation: str, min_delay: float = 0.0, max_delay: Optional[float] = None) -> float:
+        """Sleep for a random duration within the operation budget and return it.
+
+        The pause never outlasts the active deadline.
+        """
+        duration = self.sample(operation, min_delay, max_delay)
+        if duration > 0:
+            self._sleep(duration)
+            self.total_delay += duration
+        return duration
@@ -1,4 +1,7 @@
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 def preprocess_prompt(message: str) -> list:
     newlines = [
@@ -38,6 +41,7 @@ def clean_html_gpt(html_content):
         str: Cleaned HTML string
     """
     # Parse HTML
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     
     # Find all pre elements with class="!overflow-visible"
@@ -76,6 +80,7 @@ def clean_html_claude(html_content):
         str: Cleaned HTML string
     """
     # Parse HTML
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     
     # Find all pre elements
@@ -101,4 +106,72 @@ def clean_html_claude(html_content):
             continue
     
     # Return the cleaned HTML
-    return str(soup)
\ No newline at end of file
+    return str(soup)
+
+def _default_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+HTML_PARSER = _default_parser()
+
+def _remove(element):
+    element.decompose()
+
+def _remove_parent(element):
+    if element.parent is not None:
+        element.parent.decompose()
+
+CLEANUP_ACTIONS = {
+    'remove': _remove,
+    'remove_parent': _remove_parent,
+}
+
+def parse_html(html_content: str, rules: Optional[List[Dict[str, Any]]] = None, parser: Optional[str] = None) -> 'BeautifulSoup':
+    """
+    Parse HTML once and apply cleanup rules to the tree in place.
+
+    Each rule is a dict with a CSS ``selector`` and an ``action`` from
+    ``CLEANUP_ACTIONS`` (``remove`` or ``remove_parent``). Rules run in order.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content or '', parser or HTML_PARSER)
+    for rule in rules or []:
+        action = CLEANUP_ACTIONS[rule.get('action', 'remove')]
+        for element in soup.select(rule['selector']):
+            action(element)
+    return soup
+
+def soup_to_html(soup: 'BeautifulSoup') -> str:
+    # lxml wraps fragments in <html><body>, only return what was parsed
+    if soup.body is not None and soup.body.parent is soup.html and soup.html.parent is soup:
+        return soup.body.decode_contents()
+    return str(soup)
+
+def soup_to_text(soup: 'BeautifulSoup') -> str:
+    return soup.get_text()
+
+def soup_to_markdown(soup: 'BeautifulSoup') -> str:
+    from markdownify import MarkdownConverter
+    return MarkdownConverter().convert_soup(soup)
+
+def extract_content(html_content: str, rules: Optional[List[Dict[str, Any]]] = None, parser: Optional[str] = None) -> Dict[str, str]:
+    """
+    Parse HTML a single time and emit cleaned HTML, text and markdown from the same tree.
+
+    Args:
+        html_content (str): Input HTML string
+        rules (list): Cleanup rules, see ``parse_html``
+        parser (str): BeautifulSoup parser, defaults to lxml when installed
+
+    Returns:
+        dict: ``html``, ``text`` and ``markdown`` of the cleaned tree
+    """
+    soup = parse_html(html_content, rules, parser)
+    return {
+        'html': soup_to_html(soup),
+        'text': soup_to_text(soup),
+        'markdown': soup_to_markdown(soup)
+    }
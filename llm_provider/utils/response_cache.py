@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize newlines and trailing whitespace so equivalent prompts share a key."""
+    from .preprocessing import preprocess_prompt
+    return '\n'.join(line.rstrip() for line in preprocess_prompt(prompt)).strip()
+
+class ResponseCache:
+    """Prompt to response cache with an in-memory LRU in front of a SQLite store.
+
+    Entries expire after ``ttl`` seconds (never when None). The disk store is
+    trimmed to ``max_entries`` and ``max_bytes`` by evicting the least recently
+    used entries.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: int = 128,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        persist: bool = True
+    ):
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if persist:
+            if path is None:
+                path = os.path.join(os.path.expanduser("~"), "LLMProvider", "response_cache.sqlite3")
+            directory = os.path.dirname(os.path.abspath(path))
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+        self.path = path
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], prompt: str, context: Optional[str] = None) -> str:
+        prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode('utf-8')).hexdigest()
+        material = json.dumps([provider, model or '', prompt_hash, context or ''])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self.stats['memory_hits'] += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at, now):
+                        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, created_at, value)
+                        self.stats['hits'] += 1
+                        self.stats['disk_hits'] += 1
+                        return json.loads(value)
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        now = time.time()
+        value = json.dumps(response)
+        with self._lock:
+            self._remember(key, now, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now)
+                )
+                self._evict(now)
+                self._conn.commit()
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            cursor = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self.stats['evictions'] += cursor.rowcount
+
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        for (key,) in evicted:
+            self._memory.pop(key, None)
+        self.stats['evictions'] += len(evicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+            if self._conn is not None:
+                stats['disk_entries'], stats['disk_bytes'] = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None